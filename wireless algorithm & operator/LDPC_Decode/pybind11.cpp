@@ -39,16 +39,24 @@ void ensure_resources_init() {
     }
 }
 
-at::Tensor run_ldpc_decode_1192(at::Tensor &bits, const at::Tensor &h_matrix) {
+// 每个核写回 g_maskDevice 的区间: 8 个 int32，[0] 为该核所有行、所有迭代累加的校验子重量
+static const int kNumCores = 8;
+static const int kMaskWordsPerCore = 8;
+
+// 逐 chunk 发射 Kernel; mask_sums 非空时在每次发射后把 g_maskDevice 异步拷到其第 chunk 行
+static void launch_chunks(at::Tensor &bits, const at::Tensor &h_matrix, at::Tensor *mask_sums) {
     auto acl_stream = c10_npu::getCurrentNPUStream().stream(false);
     ensure_resources_init();
 
     uint8_t* base_bits_ptr = (uint8_t*)bits.data_ptr();
     void* h_ptr = h_matrix.data_ptr();
 
-    const int num_chunks = 12; 
     const int rows_per_chunk = 256;
     const int row_len = 512;
+    // 行数由调用方决定 (Python 侧调度器负责把任意帧数补齐到 256 的整数倍)
+    TORCH_CHECK(bits.size(0) % rows_per_chunk == 0, "rows must be a multiple of ", rows_per_chunk);
+    const int num_chunks = bits.size(0) / rows_per_chunk;
+    const size_t mask_bytes = kNumCores * kMaskWordsPerCore * sizeof(int32_t);
 
     // --- 极致性能模式 2.0：Loop Sinking ---
     for (int chunk = 0; chunk < num_chunks; ++chunk) {
@@ -57,17 +65,38 @@ at::Tensor run_ldpc_decode_1192(at::Tensor &bits, const at::Tensor &h_matrix) {
         // 【修改点】：直接发射一次 Kernel，传入 max_iter 参数
         // 移除了 Host 侧的 for (i < max_iter) 循环
         ACLRT_LAUNCH_KERNEL(matmul_custom)(
-            8, acl_stream,
+            kNumCores, acl_stream,
             current_bits_ptr, h_ptr, g_c1Device, g_maskDevice, g_cDevice,
             g_workspaceDevice, g_tilingDevice// 传入迭代次数
         );
+
+        if (mask_sums) {
+            // 同一 stream 上排队，下一个 chunk 覆盖 g_maskDevice 前完成拷贝
+            void* dst = (uint8_t*)mask_sums->data_ptr() + chunk * mask_bytes;
+            aclrtMemcpyAsync(dst, mask_bytes, g_maskDevice, mask_bytes, ACL_MEMCPY_DEVICE_TO_DEVICE, acl_stream);
+        }
     }
+}
 
+at::Tensor run_ldpc_decode_1192(at::Tensor &bits, const at::Tensor &h_matrix) {
+    launch_chunks(bits, h_matrix, nullptr);
     // aclrtSynchronizeStream(acl_stream); 
     return bits;
 }
+
+// 带收敛统计的译码: 额外返回 [num_chunks, 8] int32，每个 chunk 每个核的累加校验子重量
+// (Kernel 内为 int16 累加)。为 0 表示该核的全部帧在第一次校验时即已满足，数值越大说明
+// 该核的帧收敛越慢或未收敛; 逐帧的迭代次数需要修改 Kernel 才能导出
+std::tuple<at::Tensor, at::Tensor> run_ldpc_decode_stats(at::Tensor &bits, const at::Tensor &h_matrix) {
+    const int num_chunks = bits.size(0) / 256;
+    auto mask_sums = at::empty({num_chunks, kNumCores, kMaskWordsPerCore},
+                               bits.options().dtype(at::kInt));
+    launch_chunks(bits, h_matrix, &mask_sums);
+    return std::make_tuple(bits, mask_sums.select(2, 0));
+}
 } // namespace ldpc_decoder
 
 PYBIND11_MODULE(ldpc_custom, m) {
     m.def("run_ldpc_decode", &ldpc_decoder::run_ldpc_decode_1192);
+    m.def("run_ldpc_decode_stats", &ldpc_decoder::run_ldpc_decode_stats);
 }
\ No newline at end of file
@@ -2,72 +2,31 @@ import numpy as np
 import os
 import sys
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "common"))
+from gf2_packed import gf2_is_orthogonal, gf2_systematic_generator
+from tanner_graph import TannerGraph
+
 def read_alist(alist_file):
     """读取 Alist 文件"""
     print(f"1. Reading {alist_file}...")
     try:
-        with open(alist_file, 'r') as f:
-            content = f.read().split()
+        graph = TannerGraph.from_alist(alist_file)
     except FileNotFoundError:
         print(f"Error: {alist_file} not found.")
         sys.exit(1)
-
-    iterator = iter(content)
-    try:
-        n_cols = int(next(iterator)) # 504
-        n_rows = int(next(iterator)) # 252
-        max_col_weight = int(next(iterator))
-        max_row_weight = int(next(iterator))
-
-        for _ in range(n_cols + n_rows + n_cols * max_col_weight): next(iterator)
-
-        H = np.zeros((n_rows, n_cols), dtype=np.uint8)
-        for r in range(n_rows):
-            for _ in range(max_row_weight):
-                val = int(next(iterator))
-                if val > 0:
-                    H[r, val - 1] = 1
-        return H
-    except StopIteration:
+    except ValueError:
         print("Error: Alist file incomplete.")
         sys.exit(1)
+    return graph.to_dense()
 
 def calculate_G(H_orig):
     """计算 G 矩阵"""
     print("2. Calculating Generator Matrix G...")
-    H = H_orig.copy()
-    M, N = H.shape
-    K = N - M
-    col_perm = np.arange(N)
-    pivot_row = 0
-
-    for col in range(N - M, N):
-        if pivot_row >= M: break
-        if H[pivot_row, col] == 0:
-            swap_rows = np.where(H[pivot_row+1:, col] == 1)[0]
-            if len(swap_rows) > 0:
-                H[[pivot_row, pivot_row + 1 + swap_rows[0]]] = H[[pivot_row + 1 + swap_rows[0], pivot_row]]
-            else:
-                swap_cols = np.where(H[pivot_row, :N-M] == 1)[0]
-                if len(swap_cols) > 0:
-                    src = swap_cols[0]
-                    H[:, [col, src]] = H[:, [src, col]]
-                    col_perm[[col, src]] = col_perm[[src, col]]
-                else:
-                    continue
-        rows_to_xor = np.where(H[:, col] == 1)[0]
-        for r in rows_to_xor:
-            if r != pivot_row:
-                H[r] ^= H[pivot_row]
-        pivot_row += 1
-
-    P_T = H[:, :K]
-    G_sys = np.hstack((np.eye(K, dtype=np.uint8), P_T.T))
-    
-    G_final = np.zeros_like(G_sys)
-    for i in range(N):
-        G_final[:, col_perm[i]] = G_sys[:, i]
-        
+    G_final, col_perm, rank = gf2_systematic_generator(H_orig)
+    if rank < H_orig.shape[0]:
+        print(f"   Warning: H is rank deficient (rank={rank}), G has {G_final.shape[0]} rows.")
+    if not gf2_is_orthogonal(G_final, H_orig):
+        print("   Error: G * H^T != 0")
     return G_final
 
 def main():
@@ -4,14 +4,22 @@
 # LDPC Matrix Verification and Decoding Simulation Script
 # ===============================================================================
 
+import os
+import sys
+
 import numpy as np
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "common"))
+from gf2_packed import PackedCheckMatrix, gf2_matmul, gf2_orthogonality_errors
+from ldpc_codes import get_code_spec
+
 def verify_ldpc_system():
     # 设定维度参数
+    spec = get_code_spec("wimax")
     M = 256  # 帧数
-    N = 576  # 码长
-    K = 288  # 信息位长
-    MAX_ITER = 50  # 最大迭代次数 (与 C++ 保持一致)
+    N = spec.valid_code_len  # 码长 576
+    K = spec.valid_info_len  # 信息位长 288
+    MAX_ITER = spec.max_iter  # 最大迭代次数 50 (与 C++ 保持一致)
 
     print(f"Checking LDPC System with M={M}, N={N}, K={K}...")
 
@@ -43,9 +51,8 @@ def verify_ldpc_system():
     print("-" * 60)
     print("Step 1: Verifying Matrix Orthogonality (G * H^T = 0)")
     
-    # 矩阵乘法: (288, 576) x (576, 288) -> (288, 288)
-    check_matrix = np.matmul(G_matrix, x2_gm) % 2
-    non_zero_count = np.count_nonzero(check_matrix)
+    # (288, 576) x (576, 288) -> (288, 288)，G 按列打包后按 H 的非零位置异或折叠，再 popcount 计数
+    non_zero_count = gf2_orthogonality_errors(G_matrix, x2_gm.T)
     
     if non_zero_count == 0:
         print("[PASS] Matrices are compatible. G * H^T is all zeros.")
@@ -64,7 +71,7 @@ def verify_ldpc_system():
     msgs = np.random.randint(0, 2, [M, K]).astype(np.uint8)
     
     # 编码得到“完美”码字 (Golden)
-    codewords = np.matmul(msgs, G_matrix) % 2
+    codewords = gf2_matmul(msgs, G_matrix)
     
     # 注入错误
     error_rate = 0.005 # 2% 误码率
@@ -89,16 +96,17 @@ def verify_ldpc_system():
     
     # 复制一份输入数据用于处理
     current_data = x1_gm.copy()
+    check_engine = PackedCheckMatrix(x2_gm)
     success = False
     
     for i in range(MAX_ITER):
         # A. 计算伴随式 (Syndrome) [M, K]
         #    S = x * H^T
-        syndrome = np.matmul(current_data, x2_gm) % 2
+        syndrome = check_engine.syndrome(current_data)
         
         # B. 检查校验和
         #    如果某行的 Syndrome 全为 0，说明该帧校验通过
-        row_syndrome_sum = np.sum(syndrome, axis=1) # [M]
+        row_syndrome_sum = np.sum(syndrome, axis=1, dtype=np.int32) # [M]
         total_syndrome_sum = np.sum(row_syndrome_sum)
         
         print(f"  Iter {i:02d}: Total Syndrome Sum = {total_syndrome_sum}")
@@ -116,7 +124,7 @@ def verify_ldpc_system():
         # D. 计算投票 (Votes) [M, N]
         #    Votes = Syndrome * H (即 x2_gm.T)
         #    注意：这里是整数矩阵乘法，不取模
-        votes = np.matmul(syndrome, x2_gm.T)
+        votes = check_engine.votes(syndrome)
         
         # E. 翻转决策
         #    1. 找每行的最大票数
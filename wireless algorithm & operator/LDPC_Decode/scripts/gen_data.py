@@ -200,60 +200,40 @@
 # coding=utf-8
 import numpy as np
 import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "common"))
+from code_profile import load_code_profile
+from ldpc_bitflip import bitflip_decode_incremental
+
+PEG_ALIST = os.path.join(os.path.dirname(os.path.abspath(__file__)), "PEGReg252x504.alist")
 
 # 定义有效数据长度常量
 VALID_CODE_LEN = 504
 VALID_INFO_LEN = 252
 
-def python_simulate_ldpc(received_bits, H_transposed, perfect_codewords, max_iter=1):
+def python_simulate_ldpc(received_bits, H, perfect_codewords, max_iter=1):
     print(f"Starting Python Simulation for {max_iter} iterations...")
-    
-    current_bits = received_bits.astype(np.int32).copy()
-    H_forward = H_transposed.T 
-    
-    M, N = current_bits.shape
-    
+
     # --- 打印初始误码数 ---
-    initial_errors = np.sum(current_bits[:, :VALID_CODE_LEN] != perfect_codewords[:, :VALID_CODE_LEN])
+    initial_errors = np.sum(received_bits[:, :VALID_CODE_LEN] != perfect_codewords[:, :VALID_CODE_LEN])
     print(f"Initial Valid Errors (Before Decoding): {initial_errors}")
 
-    for i in range(max_iter):
-        # 1. 校验子计算
-        syndromes_raw = np.matmul(current_bits, H_transposed.astype(np.int32))
-        syndromes = syndromes_raw % 2
-        
-        # 2. 检查收敛
-        row_check_sum = np.sum(syndromes, axis=1)
-        converged_count = np.sum(row_check_sum == 0)
-        
-        if converged_count == M:
-            print(f"  >> Simulation converged at iteration {i} (All Parity Checks Passed)")
-            break
+    # 整批向量化译码，已收敛的帧自动冻结；校验子 / 投票在迭代间增量更新，结果与逐行循环逐比特一致
+    decoded_bits, flip_counts, stats = bitflip_decode_incremental(received_bits, H, max_iter=max_iter,
+                                                                  return_stats=True)
+    total_bits = received_bits.shape[0] * received_bits.shape[1]
+    for i, flips in enumerate(flip_counts):
+        # 每次迭代只需更新翻转比特相邻的校验与投票，占全量重算的比例约为 flips / total_bits
+        print(f"  Iter {i:02d}: Flipped {flips} bits ({flips / total_bits:.2%} of U)")
 
-        # 3. 投票
-        votes = np.matmul(syndromes, H_forward.astype(np.int32))
-        
-        # 4. 翻转
-        for r in range(M):
-            if row_check_sum[r] == 0:
-                continue
-            
-            row_votes = votes[r] 
-            max_val = np.max(row_votes)
-            
-            # Padding 区域票数为0，不会翻转，保留原样
-            if max_val > 0:
-                flip_mask = (row_votes == max_val)
-                current_bits[r] = np.bitwise_xor(current_bits[r], flip_mask.astype(np.int32))
-        
-        # =================================================================
-        # 【新增】打印每一轮翻转后的错误数
-        # =================================================================
-        # 注意：必须使用切片 [:VALID_CODE_LEN]，忽略 Padding 区域的噪声
-        current_errors = np.sum(current_bits[:, :VALID_CODE_LEN] != perfect_codewords[:, :VALID_CODE_LEN])
-        print(f"  [Iteration {i}] Post-Flip Valid Errors: {current_errors}")
-        
-    return current_bits.astype(np.int8)
+    # 注意：必须使用切片 [:VALID_CODE_LEN]，忽略 Padding 区域的噪声
+    current_errors = np.sum(decoded_bits[:, :VALID_CODE_LEN] != perfect_codewords[:, :VALID_CODE_LEN])
+    print(f"  Post-Decoding Valid Errors: {current_errors}")
+    print(f"  Convergence: {stats.summary()}")
+    print(f"  Iteration Histogram (converged frames): {stats.histogram().tolist()}")
+
+    return decoded_bits
 
 def gen_golden_data():
     # 昇腾对齐后的维度
@@ -263,14 +243,14 @@ def gen_golden_data():
 
     print(f"Generating realistic noisy data (Padding Included)...")
 
-    # 1. 读取矩阵
+    # 1. 读取矩阵 (码配置缓存: 首次由 alist 推导 H^T / G 并补齐到 512x256 / 256x512，之后直接 mmap 加载)
     try:
-        # 请确保路径正确
-        x2_gm = np.fromfile("./matrix_H_transposed_padded_512x256.bin", dtype=np.uint8).reshape([N, K])
-        G_matrix = np.fromfile("./matrix_G_padded_256x512.bin", dtype=np.uint8).reshape([K, N])
+        profile = load_code_profile(PEG_ALIST, pad_to=(K, N))
     except FileNotFoundError:
-        print("Error: Matrix files not found. Please run gen_matrices_only.py first.")
+        print(f"Error: {PEG_ALIST} not found.")
         return
+    x2_gm = profile.H_transposed
+    G_matrix = profile.G
 
     # 2. 编码
     msgs = np.random.randint(0, 2, [M, K]).astype(np.uint8)
@@ -295,7 +275,7 @@ def gen_golden_data():
     print("\n" + "="*40)
     print("Running Python simulation...")
     print("="*40)
-    simulated_output = python_simulate_ldpc(x1_gm, x2_gm, perfect_codewords, max_iter=20)
+    simulated_output = python_simulate_ldpc(x1_gm, profile, perfect_codewords, max_iter=20)
     
     # 5. 结果对比
     diff_count = np.sum(simulated_output[:, :VALID_CODE_LEN] != perfect_codewords[:, :VALID_CODE_LEN])
@@ -8,37 +8,29 @@
 # MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
 # ===============================================================================
 
+import os
 import sys
 import numpy as np
 
-# for float32
-relative_tol = 1e-6
-absolute_tol = 1e-9
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "common"))
+from bit_compare import compare_bit_files
+
+# 每帧 Padding 后码长与有效码长 (golden 为仿真译码输出，Padding 列同样参与对比)
+CODE_LEN = 512
+VALID_CODE_LEN = 504
+# 允许的误比特率
 error_tol = 1e-4
 
 
 def verify_result(output, golden):
-    output = np.fromfile(output, dtype=np.int8).reshape(-1)
-    golden = np.fromfile(golden, dtype=np.int8).reshape(-1)
-    different_element_results = np.isclose(output,
-                                           golden,
-                                           rtol=relative_tol,
-                                           atol=absolute_tol,
-                                           equal_nan=True)
-    different_element_indexes = np.where(different_element_results == False)[0]
-    for index in range(len(different_element_indexes)):
-        real_index = different_element_indexes[index]
-        golden_data = golden[real_index]
-        output_data = output[real_index]
-        print(
-            "data index: %06d, expected: %-.9f, actual: %-.9f, rdiff: %-.6f" %
-            (real_index, golden_data, output_data,
-             abs(output_data - golden_data) / golden_data))
-        if index == 100:
-            break
-    error_ratio = float(different_element_indexes.size) / golden.size
-    print("error ratio: %.4f, tolerance: %.4f" % (error_ratio, error_tol))
-    return error_ratio <= error_tol
+    # 按比特精确对比: 内存映射分块读取，打包后逐帧 XOR + popcount
+    result = compare_bit_files(output, golden, np.int8, CODE_LEN)
+    print(result.report())
+    # 仅供参考: 有效列的误码统计，不影响判定
+    valid = compare_bit_files(output, golden, np.int8, CODE_LEN, VALID_CODE_LEN)
+    print("valid columns (%d): bit errors: %d, BER: %.4e" % (VALID_CODE_LEN, valid.bit_errors, valid.ber))
+    print("error ratio: %.4f, tolerance: %.4f" % (result.ber, error_tol))
+    return result.passed(error_tol)
 
 
 if __name__ == '__main__':
@@ -3,8 +3,12 @@ import torch_npu
 import numpy as np
 import time
 import os
+import sys
 import ldpc_custom
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "common"))
+from frame_source import FrameSource
+
 def load_bin_with_tiling(path, dtype, shape):
     """
     读取二进制文件，如果文件尺寸不足，则循环复制数据以匹配目标 shape
@@ -39,16 +43,16 @@ def test_ldpc_logic():
     
     print(f"🔍 开始 LDPC 正确性与性能测试 (OrangePi AI Pro - 310B1)...")
 
-    # --- 1. 导入数据 (应用循环填充逻辑) ---
+    # --- 1. 导入数据 (内存映射 + 按 256 行一组环形取用，Host 侧不复制整份数据) ---
     # 预期输入形状: (3072, 512)
     # 预期 H 矩阵形状: (512, 256)
-    input_bits = load_bin_with_tiling("../input/x1_gm.bin", np.int8, (total_rows, K))
     h_matrix = load_bin_with_tiling("../input/x2_gm.bin", np.int8, (K, N))
-    golden_bits = load_bin_with_tiling("../output/golden.bin", np.int8, (M, K)) # Golden 通常只有一组
-
-    if input_bits is None or h_matrix is None:
+    if not os.path.exists("../input/x1_gm.bin") or h_matrix is None:
         print("❌ 错误: 关键输入文件缺失，请检查路径！")
         return
+    input_bits = FrameSource("../input/x1_gm.bin", np.int8, K).to_tensor(num_chunks, device)
+    # Golden 通常只有一组
+    golden_source = FrameSource("../output/golden.bin", np.int8, K) if os.path.exists("../output/golden.bin") else None
 
     # --- 2. 正确性校验 (验证第一组数据) ---
     print("🧪 正在执行正确性校验...")
@@ -58,12 +62,10 @@ def test_ldpc_logic():
     # 启动 NPU 算子，执行 20 次迭代
     ldpc_custom.run_ldpc_decode(verify_bits, h_matrix)
     
-    if golden_bits is not None:
+    if golden_source is not None:
         # 提取第一组 256 行结果进行比对
         npu_res_first = verify_bits[:256, :].cpu().numpy()
-        golden_np = golden_bits.cpu().numpy()
-        
-        error_count = np.sum(npu_res_first != golden_np)
+        error_count, _ = golden_source.compare(npu_res_first, n_chunks=1)
         if error_count == 0:
             print("✅ [Success] 数据正确性比对通过！")
         else:
@@ -79,7 +81,7 @@ def test_ldpc_logic():
         _ = ldpc_custom.run_ldpc_decode(input_bits, h_matrix)
         
         # 模拟视频数据提取逻辑
-        video_data = input_bits.view(12, 256, 512)[:, :, :252]
+        video_data = input_bits.view(num_chunks, 256, 512)[:, :, :252]
 
     torch.npu.synchronize()
     end_time = time.perf_counter()
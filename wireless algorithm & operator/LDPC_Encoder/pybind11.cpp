@@ -38,8 +38,10 @@ at::Tensor run_ldpc_encode_1192(at::Tensor &bits_in, const at::Tensor &h_matrix)
     // --- 关键修正 2：确保输入输出内存完全连续 ---
     auto a_contig = bits_in.contiguous();
     auto b_contig = h_matrix.contiguous();
-    // 输出维度：12 组 * 256 行 = 3072 行，512 列
-    auto output = at::empty({3072, 512}, bits_in.options().dtype(at::kShort));
+    // 输出维度：num_chunks 组 * 256 行，512 列 (行数由调用方决定，需为 256 的整数倍)
+    TORCH_CHECK(a_contig.size(0) % 256 == 0, "rows must be a multiple of 256");
+    const int num_chunks = a_contig.size(0) / 256;
+    auto output = at::empty({num_chunks * 256, 512}, bits_in.options().dtype(at::kShort));
 
     int8_t* in_ptr_base  = (int8_t*)a_contig.data_ptr();
     int16_t* out_ptr_base = (int16_t*)output.data_ptr();
@@ -49,7 +51,7 @@ at::Tensor run_ldpc_encode_1192(at::Tensor &bits_in, const at::Tensor &h_matrix)
     uint32_t blockDim = 8; 
 
     // --- 关键修正 3：修正指针算术偏移 ---
-    for (int chunk = 0; chunk < 12; ++chunk) {
+    for (int chunk = 0; chunk < num_chunks; ++chunk) {
         // A 矩阵 (int8)：每组偏移 256 * 256 字节
         void* cur_in  = (void*)(in_ptr_base + chunk * 256 * 256);
         // C 矩阵 (int16)：每组偏移 256 * 512 个元素
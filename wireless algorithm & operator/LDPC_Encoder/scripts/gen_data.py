@@ -10,6 +10,10 @@
 
 import numpy as np
 import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "common"))
+from gf2_packed import PackedEncoder
 
 
 def gen_golden_data():
@@ -19,8 +23,8 @@ def gen_golden_data():
 
     x1_gm = np.random.randint(0, 2, [M, K]).astype(np.int16) #随机生成的比特流
     x2_gm = np.fromfile("./matrix_G_padded_256x512.bin", dtype = np.int8).reshape(K,N).astype(np.int16) #读入LDPC矩阵
-    golden = np.matmul(x1_gm,x2_gm).astype(np.int16)
-    golden = np.mod(golden,2)
+    # GF(2) 编码: 打包后按 8 比特查表异或，结果与 np.mod(np.matmul(x1_gm, x2_gm), 2) 一致
+    golden = PackedEncoder(x2_gm).encode(x1_gm, dtype=np.int16)
     os.system("mkdir -p input")
     os.system("mkdir -p output")
     print(x1_gm.shape)
@@ -8,47 +8,34 @@
 # MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
 # ===============================================================================
 
+import os
 import sys
 import numpy as np
 
-# for float32
-relative_tol = 1e-6
-absolute_tol = 1e-9
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "common"))
+from bit_compare import compare_bit_files
+
+# 每帧码长 (golden.bin 为 [M, 512] int16)
+CODE_LEN = 512
+# 允许的误比特率
 error_tol = 1e-4
 
 
 def verify_result(output, golden):
-    output = np.fromfile(output, dtype=np.int16).reshape(-1)
-    golden = np.fromfile(golden, dtype=np.int16).reshape(-1)
-    print("output.bin的总长度为: %d\n" %len(output))
-    print("golden.bin的总长度为: %d\n" %len(golden))
-    different_element_results = np.isclose(output,
-                                           golden,
-                                           rtol=relative_tol,
-                                           atol=absolute_tol,
-                                           equal_nan=True)
-    different_element_indexes = np.where(different_element_results == False)[0]
-    print("错误的总长度为:%d \n" %len(different_element_indexes))
-    for index in range(len(different_element_indexes)):
-        real_index = different_element_indexes[index]
-        golden_data = golden[real_index]
-        output_data = output[real_index]
-        print(
-            "data index: %06d, expected: %-.9f, actual: %-.9f, rdiff: %-.6f" %
-            (real_index, golden_data, output_data,
-             abs(output_data - golden_data) / golden_data))
-        if index == 100:
-            break
-    error_ratio = float(different_element_indexes.size) / golden.size
-    print("error ratio: %.4f, tolerance: %.4f" % (error_ratio, error_tol))
-    return error_ratio <= error_tol
+    # 按比特精确对比: 内存映射分块读取，打包后逐帧 XOR + popcount
+    result = compare_bit_files(output, golden, np.int16, CODE_LEN)
+    print("output.bin的总长度为: %d\n" % (os.path.getsize(output) // 2))
+    print("golden.bin的总长度为: %d\n" % (os.path.getsize(golden) // 2))
+    print(result.report())
+    print("error ratio: %.4f, tolerance: %.4f" % (result.ber, error_tol))
+    return result.passed(error_tol)
 
 def read_bin_file(filename):
     try:
-        data = np.fromfile(filename, dtype=np.uint16)
         count = 10
+        data = np.fromfile(filename, dtype=np.uint16, count=count)
         print(f"===={filename}====")
-        for i in range(count):
+        for i in range(min(count, data.size)):
             print(f" {i+1}:{data[i]}")
         return 0
 
@@ -3,23 +3,25 @@ import torch_npu
 import numpy as np
 import ldpc_encode_custom
 import os
+import sys
 import time
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "common"))
+from frame_source import FrameSource
+from codeword_stream import CodewordStream
+
 def test_aggregation_12():
     device = "npu:0"
     M, K, N = 256, 256, 512
     num_chunks = 12
 
-    # 1. 加载数据
-    x1_single = np.fromfile("../input/x1_gm.bin", dtype=np.int8)
-    x1_all = np.tile(x1_single, num_chunks).reshape(num_chunks * M, K)
+    # 1. 加载数据 (内存映射，按 256 行一组环形取用，不在 Host 侧 tile)
+    x1_source = FrameSource("../input/x1_gm.bin", np.int8, K, rows_per_chunk=M)
     x2_g = np.fromfile("../input/x2_gm.bin", dtype=np.int8).reshape(K, N)
-    
-    golden_single = np.fromfile("../output/golden.bin", dtype=np.int16).reshape(M, N)
-    golden_all = np.tile(golden_single, (num_chunks, 1))
+    golden_source = FrameSource("../output/golden.bin", np.int16, N, rows_per_chunk=M)
 
-    # 2. 搬运到 NPU
-    bits_in = torch.from_numpy(x1_all).to(device).contiguous()
+    # 2. 搬运到 NPU (逐组拷入设备上的连续张量)
+    bits_in = x1_source.to_tensor(num_chunks, device)
     h_matrix = torch.from_numpy(x2_g).to(device).contiguous()
 
     # --- 性能测试部分 ---
@@ -61,18 +63,59 @@ def test_aggregation_12():
     # --- 结果比对部分 ---
     print(f"🚀 正在验证结果一致性...")
     res = output_npu.cpu().numpy()
-    error_mask = (res != golden_all)
-    total_errors = np.sum(error_mask)
+    total_errors, first_err = golden_source.compare(res, n_chunks=num_chunks)
     
     print(f"NPU 输出形状: {res.shape}")
     print(f"总错误点数: {total_errors} / {res.size}")
 
     if total_errors == 0:
-        print("✅ [Success] 全链路 12 组聚合验证通过！")
+        print(f"✅ [Success] 全链路 {num_chunks} 组聚合验证通过！")
     else:
-        first_err = np.where(error_mask.flatten())[0][0]
-        r, c = divmod(first_err, N)
-        print(f"❌ 首次错误发生在: 第 {r//256} 组, 行 {r%256}, 列 {c}")
+        group, r, c = first_err
+        print(f"❌ 首次错误发生在: 第 {group} 组, 行 {r}, 列 {c}")
+
+def test_stream(total_chunks=4096, window_chunks=12, seed=0):
+    """
+    流式吞吐与正确性测试: 每个窗口由 CodewordStream 即时生成互不相同的信息位，
+    设备输出与按组重新生成的码字逐组对比，Host / 设备内存只占一个窗口
+    """
+    device = "npu:0"
+    M, K, N = 256, 256, 512
+    x2_g = np.fromfile("../input/x2_gm.bin", dtype=np.int8).reshape(K, N)
+    h_matrix = torch.from_numpy(x2_g).to(device).contiguous()
+    stream = CodewordStream(x2_g, seed=seed, rows_per_chunk=M, valid_info_len=252)
+
+    total_errors = 0
+    first_err = None
+    device_ms = 0.0
+    for start in range(0, total_chunks, window_chunks):
+        n_chunks = min(window_chunks, total_chunks - start)
+        bits_in = stream.to_tensor(n_chunks, device, field="msgs", start=start)
+
+        start_event = torch.npu.Event(enable_timing=True)
+        end_event = torch.npu.Event(enable_timing=True)
+        start_event.record()
+        output_npu = ldpc_encode_custom.run_ldpc_encode(bits_in, h_matrix)
+        end_event.record()
+        torch.npu.synchronize()
+        device_ms += start_event.elapsed_time(end_event)
+
+        errors, err = stream.compare(output_npu.cpu().numpy(), start=start)
+        total_errors += errors
+        first_err = first_err or err
+
+    frames = total_chunks * M
+    print(f"流式测试: {frames} 帧 (seed={seed}), 算子累计耗时 {device_ms:.2f} ms, "
+          f"{frames / device_ms * 1000:.0f} frames/s")
+    if total_errors == 0:
+        print(f"✅ [Success] {total_chunks} 组流式数据验证通过！")
+    else:
+        group, r, c = first_err
+        print(f"❌ 总错误点数: {total_errors}, 首次错误发生在: 第 {group} 组, 行 {r}, 列 {c}")
 
 if __name__ == "__main__":
-    test_aggregation_12()
\ No newline at end of file
+    # python test_ldpc_encode_1192.py stream [组数] 运行流式测试
+    if len(sys.argv) > 1 and sys.argv[1] == "stream":
+        test_stream(int(sys.argv[2]) if len(sys.argv) > 2 else 4096)
+    else:
+        test_aggregation_12()
\ No newline at end of file
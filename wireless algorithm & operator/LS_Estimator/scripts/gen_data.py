@@ -2,6 +2,10 @@
 # coding=utf-8
 import numpy as np
 import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "common"))
+from qam import get_constellation
 
 # ==================== 1. 系统参数配置 ====================
 N_SUBCARRIERS = 256
@@ -41,9 +45,8 @@ QPSK_PILOT_VALUES = np.array([
 # ==================== 2. 工具函数 ====================
 
 def generate_64qam_constellation():
-    levels = np.array([-7, -5, -3, -1, 1, 3, 5, 7])
-    constellation = np.array([complex(i, q) for i in levels for q in levels])
-    return constellation / np.sqrt(np.mean(np.abs(constellation)**2))
+    """64 个归一化星座点 (平均功率 1)，取自公共星座库"""
+    return get_constellation(64, "binary").points
 
 def build_compact_matrix():
     """构建针对非等间距导频的插值估计矩阵 M"""
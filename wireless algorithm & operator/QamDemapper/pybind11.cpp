@@ -36,9 +36,29 @@ at::Tensor run_qam_demod(const at::Tensor& input_I, const at::Tensor& input_Q) {
     return output;
 }
 
+// 打包输出: Kernel 仍按每比特一个 uint8 写入设备侧临时缓冲，随后在设备上按
+// common/bit_format 的格式打包 (第 j 比特位于第 j/8 字节的第 j%8 位，LSB 优先)，
+// 输出 ceil(6N/8) 字节，D2H 数据量为逐比特输出的 1/8
+at::Tensor run_qam_demod_packed(const at::Tensor& input_I, const at::Tensor& input_Q) {
+    at::Tensor bits = run_qam_demod(input_I, input_Q);
+
+    int64_t num_bits = bits.numel();
+    int64_t num_bytes = (num_bits + 7) / 8;
+    if (num_bytes * 8 != num_bits) {
+        bits = at::constant_pad_nd(bits, {0, num_bytes * 8 - num_bits}, 0);
+    }
+    auto int_options = at::TensorOptions().dtype(at::kInt).device(bits.device());
+    at::Tensor shifts = at::arange(8, int_options);
+    at::Tensor weighted = at::bitwise_left_shift(bits.view({num_bytes, 8}).to(at::kInt), shifts);
+    return weighted.sum(1, false, at::kInt).to(at::kByte);
+}
+
 // 定义 Pybind11 模块
 PYBIND11_MODULE(qamdemapper_custom, m) {
     m.doc() = "QAM Demapper operator for Ascend NPU";
     m.def("run_qam_demod", &run_qam_demod, "Run QAM Demapper Kernel",
           pybind11::arg("input_I"), pybind11::arg("input_Q"));
+    m.def("run_qam_demod_packed", &run_qam_demod_packed,
+          "Run QAM Demapper Kernel, output packed bits (LSB first, ceil(6N/8) bytes)",
+          pybind11::arg("input_I"), pybind11::arg("input_Q"));
 }
\ No newline at end of file
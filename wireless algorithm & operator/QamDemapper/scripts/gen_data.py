@@ -1,5 +1,10 @@
 import numpy as np
 import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "common"))
+import bit_format
+from qam import get_constellation, qam64_hard_demap
 
 def generate_qam_hard_demapper_test_data():
     """Generate 64-QAM hard demodulation test data - Binary mapping (NO Gray code)"""
@@ -29,22 +34,18 @@ def generate_qam_hard_demapper_test_data():
     print(f"Symbols={num_symbols}")
     print("="*70)
     
-    # 8个电平值（归一化）
-    levels = np.array([-7, -5, -3, -1, 1, 3, 5, 7], dtype=np.float32)
+    # 64QAM 星座 (Binary 映射，电平 [-7, ..., 7] / sqrt(42))，来自公共星座库
+    qam64 = get_constellation(64, "binary")
+    levels = qam64.levels
     norm_factor = np.sqrt(42.0)
-    levels = levels / norm_factor
     
     print(f"\nNormalized levels: {levels}")
     print(f"Normalization: sqrt(42) = {norm_factor:.6f}")
     print(f"\n⚠️  Using BINARY mapping (index = binary code)")
     print(f"   Index 0->000, 1->001, 2->010, ..., 7->111")
     
-    # 生成64QAM星座图
-    constellation = []
-    for i in levels:
-        for q in levels:
-            constellation.append(complex(i, q))
-    constellation = np.array(constellation)
+    # 64QAM星座图: 符号索引 (I 高 3 位，Q 低 3 位) -> 星座点
+    constellation = qam64.points
     
     # 生成随机符号
     symbol_indices = np.random.randint(0, 64, num_symbols)
@@ -60,26 +61,9 @@ def generate_qam_hard_demapper_test_data():
     
     # ========== 硬解调（普通二进制） ==========
     def hard_demod_binary(symbols, levels):
-        num_symbols = len(symbols)
-        i_comp = symbols.real
-        q_comp = symbols.imag
-        
-        # 找最近电平的索引（索引就是二进制码）
-        i_dist = np.abs(levels[:, np.newaxis] - i_comp)
-        q_dist = np.abs(levels[:, np.newaxis] - q_comp)
-        i_idx = np.argmin(i_dist, axis=0)  # 0-7
-        q_idx = np.argmin(q_dist, axis=0)  # 0-7
-        
-        # 直接从索引提取比特
-        bits = np.zeros(num_symbols * 6, dtype=np.uint8)
-        bits[0::6] = (i_idx >> 2) & 1
-        bits[1::6] = (i_idx >> 1) & 1
-        bits[2::6] = i_idx & 1
-        bits[3::6] = (q_idx >> 2) & 1
-        bits[4::6] = (q_idx >> 1) & 1
-        bits[5::6] = q_idx & 1
-        
-        return bits
+        # 门限切片得到最近电平索引（索引就是二进制码），不构造 N x 8 距离矩阵，
+        # 结果与逐电平距离 argmin 逐比特一致
+        return qam64_hard_demap(symbols.real, symbols.imag, levels=levels)
     
     golden_output = hard_demod_binary(rx_symbols, levels)
     
@@ -95,15 +79,20 @@ def generate_qam_hard_demapper_test_data():
     input_i_file = os.path.join(input_dir, 'input_input_I.bin')
     input_q_file = os.path.join(input_dir, 'input_input_Q.bin')
     golden_file = os.path.join(output_dir, 'golden_output.bin')
+    # 打包格式的参考 (run_qam_demod_packed 的输出格式，每字节 8 比特，LSB 优先)
+    golden_packed_file = os.path.join(output_dir, 'golden_output_packed.bin')
+    golden_packed = bit_format.pack(golden_output)
     
     rx_symbols.real.astype(np.float32).tofile(input_i_file)
     rx_symbols.imag.astype(np.float32).tofile(input_q_file)
     golden_output.tofile(golden_file)
+    golden_packed.tofile(golden_packed_file)
     
     print(f"\n✅ Files saved:")
     print(f"   {input_i_file} - {num_symbols*4} bytes")
     print(f"   {input_q_file} - {num_symbols*4} bytes")
     print(f"   {golden_file} - {len(golden_output)} bytes")
+    print(f"   {golden_packed_file} - {len(golden_packed)} bytes (packed)")
     print("="*70)
 
 
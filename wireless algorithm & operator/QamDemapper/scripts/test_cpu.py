@@ -1,7 +1,14 @@
 import torch
 import numpy as np
+import os
+import sys
 import time
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "common"))
+from qam import decision_thresholds, get_constellation
+from qam_parallel import ParallelQam
+from qam_stream import StreamingDemapper
+
 def test_qam_demod_cpu(num_symbols=262240, iterations=100):
     print(f"🖥️  正在初始化 CPU 数据 (规模: {num_symbols} 符号)...")
     
@@ -9,11 +16,14 @@ def test_qam_demod_cpu(num_symbols=262240, iterations=100):
     i_data = torch.randn(num_symbols, dtype=torch.float32)
     q_data = torch.randn(num_symbols, dtype=torch.float32)
     
-    # 64-QAM 电平定义 (归一化)
-    scale = 6.4807406984
-    levels = torch.tensor([-7, -5, -3, -1, 1, 3, 5, 7], dtype=torch.float32) / scale
-    
-    def run_cpu_logic():
+    # 64-QAM 电平定义 (归一化，公共星座库的 Binary 映射)
+    levels = torch.from_numpy(get_constellation(64, "binary").levels.astype(np.float32))
+    # 相邻电平的判决门限 (按 float32 舍入精确求出)，切片结果与距离 argmin 逐比特一致
+    thresholds = decision_thresholds(levels.numpy(), np.float32).tolist()
+    # 3 比特索引 -> 比特 (高位在前)
+    index_bits = torch.tensor([[(v >> 2) & 1, (v >> 1) & 1, v & 1] for v in range(8)], dtype=torch.uint8)
+
+    def run_cpu_argmin():
         # 1. 计算距离矩阵 (利用广播机制模拟并行计算)
         # i_data[:, None] 形状为 (N, 1), levels 为 (8,)
         # dists 形状为 (N, 8)
@@ -35,6 +45,44 @@ def test_qam_demod_cpu(num_symbols=262240, iterations=100):
         out[:, 5] = idx_q & 1
         return out
 
+    def slice_index(x):
+        # 索引 = 不大于 x 的门限个数，7 次比较累加，不构造 (N, 8) 距离矩阵
+        idx = (x >= thresholds[0]).to(torch.uint8)
+        for t in thresholds[1:]:
+            idx += (x >= t).to(torch.uint8)
+        idx[x == float("inf")] = 0
+        return idx.long()
+
+    def run_cpu_logic():
+        out = torch.empty((num_symbols, 6), dtype=torch.uint8)
+        out[:, :3] = index_bits[slice_index(i_data)]
+        out[:, 3:] = index_bits[slice_index(q_data)]
+        return out
+
+    # 流式解调: 按 16384 符号分组写入预分配输出，峰值内存与流长度无关
+    streamer = StreamingDemapper(levels=levels.numpy())
+    i_np, q_np = i_data.numpy(), q_data.numpy()
+    stream_out = np.empty(streamer.out_len(num_symbols), dtype=np.uint8)
+
+    def run_cpu_stream():
+        streamer.run((i_np, q_np), out=stream_out)
+        return torch.from_numpy(stream_out).view(num_symbols, 6)
+
+    # 多线程: 按组分给线程池 (默认 CPU 核数)，与 NPU 的 8 核并行对比
+    parallel = ParallelQam(64, "binary")
+    parallel_out = np.empty(num_symbols * 6, dtype=np.uint8)
+
+    def run_cpu_parallel():
+        parallel.hard_demap(i_np, q_np, levels=levels.numpy(), out=parallel_out)
+        return torch.from_numpy(parallel_out).view(num_symbols, 6)
+
+    if not torch.equal(run_cpu_logic(), run_cpu_argmin()):
+        raise RuntimeError("threshold slicer does not match argmin demapper")
+    if not torch.equal(run_cpu_stream(), run_cpu_argmin()):
+        raise RuntimeError("streaming demapper does not match argmin demapper")
+    if not torch.equal(run_cpu_parallel(), run_cpu_argmin()):
+        raise RuntimeError("multi-threaded demapper does not match argmin demapper")
+
     # 🔥 预热
     print("🔥 正在预热 CPU...")
     for _ in range(10):
@@ -42,23 +90,22 @@ def test_qam_demod_cpu(num_symbols=262240, iterations=100):
 
     # ⏱️ 性能测试
     print(f"⏱️  开始进行 CPU 性能测试 ({iterations} 次迭代)...")
-    start_time = time.perf_counter()
-    
-    for _ in range(iterations):
-        _ = run_cpu_logic()
-        
-    end_time = time.perf_counter()
-    
-    # 结果计算
-    avg_time_ms = ((end_time - start_time) / iterations) * 1000
-    throughput = (num_symbols / 1e6) / (avg_time_ms / 1000)
-    
     print("\n" + "="*40)
     print("QAM Demapper CPU 性能报告 (PyTorch-CPU)")
     print(f"输入规模: {num_symbols} 符号")
-    print(f"平均单次耗时: {avg_time_ms:.4f} ms")
-    print(f"吞吐量: {throughput:.4f} MSymbols/s")
+    for name, fn in (("距离 argmin", run_cpu_argmin), ("门限切片", run_cpu_logic), ("流式分组", run_cpu_stream),
+                     (f"多线程 x{parallel.workers}", run_cpu_parallel)):
+        start_time = time.perf_counter()
+        for _ in range(iterations):
+            _ = fn()
+        end_time = time.perf_counter()
+
+        # 结果计算
+        avg_time_ms = ((end_time - start_time) / iterations) * 1000
+        throughput = (num_symbols / 1e6) / (avg_time_ms / 1000)
+        print(f"[{name}] 平均单次耗时: {avg_time_ms:.4f} ms, 吞吐量: {throughput:.4f} MSymbols/s")
     print("="*40)
+    parallel.close()
 
 if __name__ == "__main__":
     # 使用你 NPU 测试时相同的规模
@@ -2,6 +2,23 @@ import numpy as np
 import sys
 import os
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "common"))
+import bit_format
+
+
+def read_bits(path, total_bits):
+    """
+    读取比特流文件: 每比特一个 uint8 (total_bits 字节) 或打包格式
+    (bit_format，ceil(total_bits/8) 字节)，按文件大小自动识别，统一返回逐比特 uint8
+    Returns:
+        (bits, packed)
+    """
+    data = np.fromfile(path, dtype=np.uint8)
+    if len(data) == bit_format.packed_len(total_bits) and len(data) != total_bits:
+        return bit_format.unpack(data, total_bits), True
+    return data, False
+
+
 def verify_qam_hard_demapper_result(output_file, golden_file):
     """验证64-QAM硬解调结果 - Binary mapping (NO Gray code)"""
     
@@ -25,18 +42,18 @@ def verify_qam_hard_demapper_result(output_file, golden_file):
         print(f"  请先运行: python scripts/gen_data.py")
         return 1
     
-    # 读取数据
-    output = np.fromfile(output_file, dtype=np.uint8)
-    golden = np.fromfile(golden_file, dtype=np.uint8)
+    # 读取数据 (打包格式解包为逐比特)
+    output, output_packed = read_bits(output_file, total_bits)
+    golden, golden_packed = read_bits(golden_file, total_bits)
     
     print(f"\n文件路径:")
     print(f"  输出文件: {output_file}")
     print(f"  参考文件: {golden_file}")
     
     print(f"\n文件大小:")
-    print(f"  输出: {len(output)} bytes")
-    print(f"  参考: {len(golden)} bytes")
-    print(f"  期望: {total_bits} bytes")
+    print(f"  输出: {os.path.getsize(output_file)} bytes{' (packed)' if output_packed else ''}")
+    print(f"  参考: {os.path.getsize(golden_file)} bytes{' (packed)' if golden_packed else ''}")
+    print(f"  期望: {total_bits} bytes (或打包 {bit_format.packed_len(total_bits)} bytes)")
     
     # 检查长度
     if len(output) != total_bits:
@@ -217,6 +234,7 @@ if __name__ == "__main__":
         print("  python scripts/verify_result.py")
         print("  或")
         print("  python scripts/verify_result.py output/output.bin output/golden_output.bin")
+        print("  (打包输出可与 output/golden_output_packed.bin 或逐比特参考比较)")
         sys.exit(1)
     
     sys.exit(verify_qam_hard_demapper_result(output_path, golden_path))
@@ -3,6 +3,11 @@ import torch_npu
 import numpy as np
 import qamdemapper_custom  # 确保编译生成的so在路径下
 import time
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "common"))
+import bit_format
 
 def test_qam_demod_performance():
     device = "npu:0"
@@ -63,5 +68,20 @@ def test_qam_demod_performance():
     else:
         print("❌ [Error] 输出维度不匹配！")
 
+    # 4. 打包输出: 与逐比特输出解包后一致，D2H 数据量为 1/8
+    start_event.record()
+    for _ in range(test_iters):
+        packed_npu = qamdemapper_custom.run_qam_demod_packed(input_I_npu, input_Q_npu)
+    end_event.record()
+    torch.npu.synchronize()
+    packed_ms = start_event.elapsed_time(end_event) / test_iters
+
+    packed = packed_npu.cpu().numpy()
+    print(f"打包输出: {packed.nbytes} bytes (逐比特 {res.nbytes} bytes)，平均单次耗时: {packed_ms:.4f} ms")
+    if np.array_equal(bit_format.unpack(packed, res.shape[0]), res):
+        print("✅ [Success] 打包输出与逐比特输出一致！")
+    else:
+        print("❌ [Error] 打包输出与逐比特输出不一致！")
+
 if __name__ == "__main__":
     test_qam_demod_performance()
\ No newline at end of file
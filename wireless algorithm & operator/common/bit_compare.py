@@ -0,0 +1,112 @@
+#!/usr/bin/python3
+# coding=utf-8
+# ===============================================================================
+# 0/1 比特文件的逐比特精确对比
+#
+# output.bin / golden.bin 以 np.memmap 映射，按帧分块流式读取，每块打包为 uint64
+# (gf2_packed.pack_bits) 后逐帧 XOR + popcount，统计误比特数 / 误帧数，
+# 记录第一个出错的帧号与列号。Host 内存占用只与块大小有关，与文件大小无关。
+# 不是 0/1 的元素单独计数，视为错误
+# ===============================================================================
+
+import os
+
+import numpy as np
+
+from gf2_packed import pack_bits, popcount
+
+# 每块帧数: 512 列 int16 时约 8 MB
+FRAMES_PER_CHUNK = 8192
+
+
+class BitCompareResult:
+    """逐比特对比的统计结果"""
+
+    def __init__(self, frame_len, valid_len):
+        self.frame_len = frame_len
+        self.valid_len = valid_len
+        self.frames = 0
+        self.bit_errors = 0
+        self.frame_errors = 0
+        self.invalid_values = 0
+        # (帧号, 列号)
+        self.first_error = None
+        self.size_mismatch = None
+
+    @property
+    def ber(self):
+        return self.bit_errors / (self.frames * self.valid_len) if self.frames else 0.0
+
+    @property
+    def fer(self):
+        return self.frame_errors / self.frames if self.frames else 0.0
+
+    def passed(self, ber_tol=0.0):
+        return (self.size_mismatch is None and self.invalid_values == 0
+                and self.frames > 0 and self.ber <= ber_tol)
+
+    def report(self):
+        lines = [f"frames: {self.frames}, bits per frame: {self.valid_len}"]
+        if self.size_mismatch is not None:
+            lines.append("size mismatch: output %d elements, golden %d elements" % self.size_mismatch)
+        lines.append(f"bit errors: {self.bit_errors}, BER: {self.ber:.4e}")
+        lines.append(f"frame errors: {self.frame_errors}, FER: {self.fer:.4e}")
+        if self.invalid_values:
+            lines.append(f"non 0/1 values: {self.invalid_values}")
+        if self.first_error is not None:
+            lines.append("first error: frame %d, column %d" % self.first_error)
+        return "\n".join(lines)
+
+
+def _map(path, dtype, frame_len):
+    n_elems = os.path.getsize(path) // np.dtype(dtype).itemsize
+    if n_elems == 0:
+        return n_elems, np.zeros((0, frame_len), dtype=dtype)
+    data = np.memmap(path, dtype=dtype, mode='r', shape=(n_elems,))
+    n_frames = n_elems // frame_len
+    return n_elems, data[:n_frames * frame_len].reshape(n_frames, frame_len)
+
+
+def compare_bits(output, golden, frame_len, valid_len=None, frames_per_chunk=FRAMES_PER_CHUNK):
+    """
+    两个 [M, frame_len] 0/1 数组的逐比特对比 (只比较前 valid_len 列)
+    Returns:
+        BitCompareResult
+    """
+    valid_len = frame_len if valid_len is None else valid_len
+    result = BitCompareResult(frame_len, valid_len)
+    n_frames = min(output.shape[0], golden.shape[0])
+
+    for start in range(0, n_frames, frames_per_chunk):
+        out_chunk = np.asarray(output[start:start + frames_per_chunk, :valid_len])
+        gold_chunk = np.asarray(golden[start:start + frames_per_chunk, :valid_len])
+        result.invalid_values += int(np.count_nonzero(out_chunk > 1) + np.count_nonzero(out_chunk < 0))
+
+        diff = pack_bits(out_chunk != 0) ^ pack_bits(gold_chunk != 0)
+        per_frame = popcount(diff).sum(axis=1, dtype=np.int64)
+        result.bit_errors += int(per_frame.sum())
+        failed = np.flatnonzero(per_frame)
+        result.frame_errors += failed.size
+        if failed.size and result.first_error is None:
+            frame = int(failed[0])
+            col = int(np.flatnonzero(out_chunk[frame] != gold_chunk[frame])[0])
+            result.first_error = (start + frame, col)
+    result.frames = n_frames
+    return result
+
+
+def compare_bit_files(output_path, golden_path, dtype, frame_len, valid_len=None,
+                      frames_per_chunk=FRAMES_PER_CHUNK):
+    """
+    逐比特对比两个二进制帧文件 (内存映射，按块流式处理)
+    Args:
+        dtype: 文件元素类型 (译码 int8，编码 int16)
+        frame_len: 每帧元素数 (Padding 后码长)
+        valid_len: 只比较每帧前 valid_len 列，None 表示整帧
+    """
+    out_elems, output = _map(output_path, dtype, frame_len)
+    gold_elems, golden = _map(golden_path, dtype, frame_len)
+    result = compare_bits(output, golden, frame_len, valid_len, frames_per_chunk)
+    if out_elems != gold_elems or out_elems % frame_len:
+        result.size_mismatch = (out_elems, gold_elems)
+    return result
@@ -0,0 +1,86 @@
+#!/usr/bin/python3
+# coding=utf-8
+# ===============================================================================
+# 打包比特交换格式 (编码 -> 调制 -> 解调 -> 译码 各级之间传递比特流)
+#
+# 格式: uint8 数组，每字节 8 个比特，沿最后一维打包
+#   第 j 个比特位于第 j // 8 个字节的第 j % 8 位 (bit 0 为最低位，即 LSB 优先)
+#   每行 (一帧 / 一段符号流) 单独打包，尾部不足 8 比特的高位补 0
+# 与 gf2_packed 的 uint64 小端位序一致: 行长为 64 比特整数倍时，打包字节可直接
+# view 为 gf2_packed 的 uint64 字 (as_words)，不需要重新打包
+#
+# 相比每比特一个 int8 / uint8 (译码、调制、解调) 或 int16 (编码输出)，
+# 数据量分别减少到 1/8 和 1/16
+# ===============================================================================
+
+import numpy as np
+
+BIT_ORDER = "little"
+
+
+def packed_len(n_bits):
+    """n_bits 个比特打包后的字节数"""
+    return (n_bits + 7) // 8
+
+
+def pack(bits):
+    """[..., N] 0/1 数组 -> [..., ceil(N/8)] uint8"""
+    bits = np.asarray(bits)
+    return np.packbits(bits.astype(np.uint8, copy=False), axis=-1, bitorder=BIT_ORDER)
+
+
+def unpack(packed, n_bits, dtype=np.uint8):
+    """pack 的逆运算: [..., ceil(N/8)] uint8 -> [..., n_bits] 0/1 数组"""
+    packed = np.asarray(packed, dtype=np.uint8)
+    bits = np.unpackbits(packed, axis=-1, count=n_bits, bitorder=BIT_ORDER)
+    return bits.astype(dtype, copy=False)
+
+
+def as_words(packed):
+    """[..., 8W] uint8 打包比特 -> [..., W] uint64 (gf2_packed 的字格式)，零拷贝"""
+    packed = np.ascontiguousarray(packed, dtype=np.uint8)
+    if packed.shape[-1] % 8:
+        raise ValueError(f"packed row of {packed.shape[-1]} bytes is not a whole number of uint64 words")
+    return packed.view("<u8")
+
+
+def from_words(words):
+    """gf2_packed 的 [..., W] uint64 字 -> [..., 8W] uint8 打包比特，零拷贝"""
+    return np.ascontiguousarray(words, dtype="<u8").view(np.uint8)
+
+
+_BIT_WEIGHTS = {}
+
+
+def _weights(device):
+    import torch
+
+    key = str(device)
+    if key not in _BIT_WEIGHTS:
+        _BIT_WEIGHTS[key] = (1 << torch.arange(8, device=device, dtype=torch.int32)).to(torch.uint8)
+    return _BIT_WEIGHTS[key]
+
+
+def pack_tensor(bits):
+    """
+    设备侧打包: [..., N] 0/1 张量 (任意整数类型) -> [..., ceil(N/8)] torch.uint8，
+    位序与 pack 一致，数据不离开设备
+    """
+    import torch
+
+    n_bits = bits.shape[-1]
+    pad = packed_len(n_bits) * 8 - n_bits
+    bits = bits.to(torch.uint8)
+    if pad:
+        bits = torch.nn.functional.pad(bits, (0, pad))
+    groups = bits.reshape(*bits.shape[:-1], -1, 8)
+    return (groups * _weights(bits.device)).sum(dim=-1, dtype=torch.uint8)
+
+
+def unpack_tensor(packed, n_bits, dtype=None):
+    """设备侧解包: [..., ceil(N/8)] torch.uint8 -> [..., n_bits] 0/1 张量"""
+    import torch
+
+    bits = (packed.unsqueeze(-1) & _weights(packed.device)) != 0
+    bits = bits.reshape(*packed.shape[:-1], -1)[..., :n_bits]
+    return bits.to(dtype or torch.uint8)
@@ -0,0 +1,244 @@
+#!/usr/bin/python3
+# coding=utf-8
+# ===============================================================================
+# LDPC 码配置 (code profile) 持久化缓存
+#
+# 由 alist / .qc 源文件一次性推导出 H、H^T、G、列置换、有效长度和 Tanner 图
+# CSR 结构，写入单个可内存映射的容器文件，之后的运行直接 mmap 加载，不再重复
+# 解析、消元和 Padding。
+#
+# 缓存键 = 源文件内容 SHA-256 + Padding 目标尺寸 + 格式版本，源文件改动后自动重建。
+#
+# 容器布局 (小端):
+#   [0:8)    魔数 b"LDPCPROF"
+#   [8:16)   uint64 头部长度 L
+#   [16:16+L) UTF-8 JSON 头部: {"version", "meta", "arrays": {名字: {dtype, shape, offset}}}
+#   数据区从头部之后第一个 64 字节对齐处开始，每个数组按 64 字节对齐连续存放，
+#   offset 为相对数据区起始的字节偏移
+# ===============================================================================
+
+import hashlib
+import json
+import os
+
+import numpy as np
+
+from gf2_packed import gf2_systematic_generator
+from qc_ldpc import QCCode
+from tanner_graph import TannerGraph
+
+PROFILE_VERSION = 1
+PROFILE_SUFFIX = ".ldpcprof"
+
+_MAGIC = b"LDPCPROF"
+_ALIGN = 64
+
+# 缓存目录可用环境变量覆盖，默认放在源文件旁的 .ldpc_profiles/ 下
+CACHE_DIR_ENV = "LDPC_PROFILE_CACHE"
+DEFAULT_CACHE_DIRNAME = ".ldpc_profiles"
+
+_ARRAY_NAMES = ("H", "H_transposed", "G", "col_perm", "check_ptr", "check_idx", "var_ptr", "var_idx")
+
+
+def source_hash(source):
+    """源文件内容的 SHA-256 (十六进制)"""
+    digest = hashlib.sha256()
+    with open(source, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _data_start(header_len):
+    """数据区起始偏移: 魔数 + 长度 + 头部之后按 64 字节对齐"""
+    return -(-(16 + header_len) // _ALIGN) * _ALIGN
+
+
+def _pad_tag(pad_to):
+    return "raw" if pad_to is None else f"{pad_to[0]}x{pad_to[1]}"
+
+
+def profile_cache_path(source, pad_to=None, cache_dir=None, digest=None):
+    """缓存文件路径: <cache_dir>/<源文件名>_<hash 前 16 位>_<Padding>_v<版本>.ldpcprof"""
+    if cache_dir is None:
+        cache_dir = os.environ.get(CACHE_DIR_ENV) or \
+            os.path.join(os.path.dirname(os.path.abspath(source)), DEFAULT_CACHE_DIRNAME)
+    if digest is None:
+        digest = source_hash(source)
+    stem = os.path.splitext(os.path.basename(source))[0]
+    return os.path.join(cache_dir, f"{stem}_{digest[:16]}_{_pad_tag(pad_to)}_v{PROFILE_VERSION}{PROFILE_SUFFIX}")
+
+
+def _read_code(source):
+    """源文件 -> (稠密 H [M, N] uint8, 附加元数据)"""
+    if source.endswith(".qc"):
+        code = QCCode.from_qc_file(source)
+        return code.to_dense(), {"kind": "qc", "z": code.z}
+    return TannerGraph.from_alist(source).to_dense(), {"kind": "alist"}
+
+
+class CodeProfile:
+    """
+    一个 LDPC 码在指定 Padding 尺寸下的全部派生数据
+
+    数组属性 (从缓存加载时为只读内存映射):
+        H            [n_checks, n_vars] uint8，Padding 后的校验矩阵
+        H_transposed [n_vars, n_checks] uint8，即译码算子的 x2_gm
+        G            [n_info, n_vars] uint8，Padding 后的生成矩阵，u x G 为原始比特顺序的码字
+        col_perm     [valid_code_len] int32，消元时的列置换
+        check_ptr / check_idx / var_ptr / var_idx: Padding 后 Tanner 图的 CSR 结构
+    标量属性:
+        valid_code_len / valid_check_len / valid_info_len: 有效码长 / 校验数 / 信息位长
+        n_vars / n_checks / n_info: Padding 后的对应尺寸
+        rank, source_hash, name, kind ("alist" / "qc")
+    """
+
+    def __init__(self, arrays, meta):
+        self.meta = dict(meta)
+        for name in _ARRAY_NAMES:
+            setattr(self, name, arrays[name])
+        for key, value in self.meta.items():
+            setattr(self, key, value)
+
+    @classmethod
+    def build(cls, source, pad_to=None, digest=None):
+        """
+        由源文件推导 (不读写缓存)
+        Args:
+            source: alist 或 .qc 文件路径
+            pad_to: (n_checks, n_vars) Padding 目标，如 (256, 512)；None 表示不补齐
+        """
+        H_valid, extra = _read_code(source)
+        valid_m, valid_n = H_valid.shape
+        G_valid, col_perm, rank = gf2_systematic_generator(H_valid)
+        valid_k = G_valid.shape[0]
+
+        n_checks, n_vars = (valid_m, valid_n) if pad_to is None else (int(pad_to[0]), int(pad_to[1]))
+        if n_checks < valid_m or n_vars < valid_n:
+            raise ValueError(f"pad_to {pad_to} is smaller than the code ({valid_m}x{valid_n})")
+        # G 的行数 (信息位) 与校验行同步补齐，例如 252x504 -> 256x512 时 G 为 256x512
+        n_info = max(n_vars - n_checks, valid_k)
+
+        H = np.zeros((n_checks, n_vars), dtype=np.uint8)
+        H[:valid_m, :valid_n] = H_valid
+        G = np.zeros((n_info, n_vars), dtype=np.uint8)
+        G[:valid_k, :valid_n] = G_valid
+        graph = TannerGraph.from_dense(H)
+
+        arrays = {
+            "H": H,
+            "H_transposed": np.ascontiguousarray(H.T),
+            "G": G,
+            "col_perm": col_perm.astype(np.int32),
+            "check_ptr": graph.check_ptr,
+            "check_idx": graph.check_idx,
+            "var_ptr": graph.var_ptr,
+            "var_idx": graph.var_idx,
+        }
+        meta = {
+            "name": os.path.splitext(os.path.basename(source))[0],
+            "source_hash": digest if digest is not None else source_hash(source),
+            "valid_code_len": valid_n,
+            "valid_check_len": valid_m,
+            "valid_info_len": valid_k,
+            "n_vars": n_vars,
+            "n_checks": n_checks,
+            "n_info": n_info,
+            "rank": int(rank),
+        }
+        meta.update(extra)
+        return cls(arrays, meta)
+
+    def save(self, path):
+        """写入容器文件 (先写临时文件再原子替换)"""
+        entries = {}
+        offset = 0
+        for name in _ARRAY_NAMES:
+            arr = np.ascontiguousarray(getattr(self, name))
+            entries[name] = {"dtype": arr.dtype.str, "shape": list(arr.shape), "offset": offset}
+            offset += -(-arr.nbytes // _ALIGN) * _ALIGN
+
+        header = {"version": PROFILE_VERSION, "meta": self.meta, "arrays": entries}
+        header_bytes = json.dumps(header).encode("utf-8")
+        data_start = _data_start(len(header_bytes))
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(_MAGIC)
+            f.write(np.uint64(len(header_bytes)).tobytes())
+            f.write(header_bytes)
+            for name in _ARRAY_NAMES:
+                arr = np.ascontiguousarray(getattr(self, name))
+                f.seek(data_start + entries[name]["offset"])
+                f.write(arr.tobytes())
+            f.truncate(data_start + offset)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        """内存映射加载容器文件，数组为只读视图，不做任何计算"""
+        with open(path, 'rb') as f:
+            if f.read(8) != _MAGIC:
+                raise ValueError(f"not an LDPC code profile: {path}")
+            header_len = int(np.frombuffer(f.read(8), dtype=np.uint64)[0])
+            header = json.loads(f.read(header_len).decode("utf-8"))
+        data_start = _data_start(header_len)
+        if header["version"] != PROFILE_VERSION:
+            raise ValueError(f"code profile version {header['version']} != {PROFILE_VERSION}: {path}")
+
+        raw = np.memmap(path, dtype=np.uint8, mode='r')
+        arrays = {}
+        for name, entry in header["arrays"].items():
+            dtype = np.dtype(entry["dtype"])
+            count = int(np.prod(entry["shape"], dtype=np.int64))
+            start = data_start + entry["offset"]
+            arrays[name] = raw[start:start + count * dtype.itemsize].view(dtype).reshape(entry["shape"])
+        return cls(arrays, header["meta"])
+
+    def tanner_graph(self):
+        """Padding 后的 TannerGraph，直接复用缓存中的 CSR 数组"""
+        return TannerGraph.from_csr(self.n_checks, self.n_vars,
+                                    self.check_ptr, self.check_idx, self.var_ptr, self.var_idx)
+
+
+def load_code_profile(source, pad_to=None, cache_dir=None, rebuild=False):
+    """
+    读取码配置: 缓存命中则直接 mmap 加载，否则推导后写入缓存
+    Args:
+        source: alist 或 .qc 文件路径
+        pad_to: (n_checks, n_vars) Padding 目标，如 (256, 512)；None 表示不补齐
+        cache_dir: 缓存目录，默认取环境变量 LDPC_PROFILE_CACHE 或源文件旁的 .ldpc_profiles/
+        rebuild: 忽略已有缓存强制重建
+    """
+    digest = source_hash(source)
+    path = profile_cache_path(source, pad_to, cache_dir, digest)
+    if not rebuild and os.path.exists(path):
+        try:
+            return CodeProfile.load(path)
+        except (ValueError, KeyError):
+            pass  # 损坏或旧格式，重建
+    CodeProfile.build(source, pad_to, digest).save(path)
+    return CodeProfile.load(path)
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    if len(sys.argv) < 2:
+        print("Usage: python code_profile.py <alist|qc> [n_checks n_vars]")
+        sys.exit(1)
+    target = (int(sys.argv[2]), int(sys.argv[3])) if len(sys.argv) >= 4 else None
+
+    start = time.perf_counter()
+    profile = load_code_profile(sys.argv[1], target)
+    first_ms = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    profile = load_code_profile(sys.argv[1], target)
+    cached_ms = (time.perf_counter() - start) * 1000
+
+    print(f"{profile.name}: valid {profile.valid_check_len}x{profile.valid_code_len} "
+          f"(K={profile.valid_info_len}), padded {profile.n_checks}x{profile.n_vars} (K={profile.n_info})")
+    print(f"  缓存文件: {profile_cache_path(sys.argv[1], target)}")
+    print(f"  首次加载: {first_ms:.1f} ms, 命中缓存: {cached_ms:.2f} ms")
@@ -0,0 +1,111 @@
+#!/usr/bin/python3
+# coding=utf-8
+# ===============================================================================
+# 可复现的流式码字生成器
+#
+# 按组 (chunk，默认 256 行) 即时生成 信息位 / 码字 / 加噪码字，第 i 组只由
+# (seed, i) 决定: 随机数生成器以 SeedSequence([seed, i]) 初始化，任意顺序、
+# 任意进程中重新生成同一组都得到相同数据。常驻内存只有编码表与当前一组，
+# 可以为吞吐测试和验证提供上百万个互不相同的帧，而不是循环复用同一个 x1_gm.bin
+# ===============================================================================
+
+from collections import namedtuple
+
+import numpy as np
+
+import bit_format
+from gf2_packed import PackedEncoder
+
+ROWS_PER_CHUNK = 256
+
+# msgs: [rows, n_info]，codewords / received: [rows, n_vars]，均为 0/1 uint8
+CodewordChunk = namedtuple("CodewordChunk", ["index", "msgs", "codewords", "received"])
+
+
+class CodewordStream:
+    """
+    Args:
+        G: [n_info, n_vars] 生成矩阵 (可为 Padding 后的 G)
+        seed: 流的种子
+        rows_per_chunk: 每组行数
+        valid_info_len: 有效信息位长，之后的信息位 (Padding) 置 0；None 表示全部有效
+        error_rate: 加噪码字的比特翻转概率 (BSC)，0 表示不加噪
+        noisy_len: 只对每帧前 noisy_len 列加噪；None 表示整帧 (含 Padding，与译码 gen_data 一致)
+    """
+
+    def __init__(self, G, seed=0, rows_per_chunk=ROWS_PER_CHUNK, valid_info_len=None,
+                 error_rate=0.0, noisy_len=None):
+        self.encoder = PackedEncoder(G)
+        self.n_info, self.n_vars = self.encoder.n_info, self.encoder.n_vars
+        self.seed = int(seed)
+        self.rows_per_chunk = int(rows_per_chunk)
+        self.valid_info_len = self.n_info if valid_info_len is None else int(valid_info_len)
+        self.error_rate = float(error_rate)
+        self.noisy_len = self.n_vars if noisy_len is None else int(noisy_len)
+
+    @classmethod
+    def from_profile(cls, profile, **kwargs):
+        """由 CodeProfile 构建，Padding 信息位自动置 0"""
+        kwargs.setdefault("valid_info_len", profile.valid_info_len)
+        return cls(profile.G, **kwargs)
+
+    def _rng(self, index):
+        return np.random.default_rng(np.random.SeedSequence([self.seed, int(index)]))
+
+    def chunk(self, index):
+        """生成第 index 组"""
+        rng = self._rng(index)
+        # 按字节抽取随机比特再解包，比逐比特 integers(0, 2) 少 8 倍随机数
+        raw = rng.integers(0, 256, (self.rows_per_chunk, bit_format.packed_len(self.valid_info_len)),
+                           dtype=np.uint8)
+        msgs = np.zeros((self.rows_per_chunk, self.n_info), dtype=np.uint8)
+        msgs[:, :self.valid_info_len] = bit_format.unpack(raw, self.valid_info_len)
+        codewords = self.encoder.encode(msgs)
+
+        received = codewords
+        if self.error_rate > 0:
+            received = codewords.copy()
+            received[:, :self.noisy_len] ^= (rng.random((self.rows_per_chunk, self.noisy_len))
+                                             < self.error_rate).astype(np.uint8)
+        return CodewordChunk(int(index), msgs, codewords, received)
+
+    def iter_chunks(self, n_chunks, start=0):
+        """依次产出第 start .. start + n_chunks - 1 组"""
+        for index in range(start, start + n_chunks):
+            yield self.chunk(index)
+
+    def to_tensor(self, n_chunks, device, field="received", dtype=np.int8, start=0):
+        """
+        把 n_chunks 组的某个字段 (msgs / codewords / received) 逐组拷入设备上的连续张量，
+        Host 侧只保留单组数据
+        """
+        import torch
+
+        width = self.n_info if field == "msgs" else self.n_vars
+        host_dtype = torch.from_numpy(np.zeros(0, dtype=dtype)).dtype
+        out = torch.empty((n_chunks * self.rows_per_chunk, width), dtype=host_dtype, device=device)
+        for offset, chunk in enumerate(self.iter_chunks(n_chunks, start)):
+            rows = slice(offset * self.rows_per_chunk, (offset + 1) * self.rows_per_chunk)
+            out[rows].copy_(torch.from_numpy(getattr(chunk, field).astype(dtype)))
+        return out
+
+    def compare(self, result, field="codewords", start=0):
+        """
+        逐组对比 result 与重新生成的某个字段，不保存整份参考数据
+        Returns:
+            total_errors: 不一致元素总数
+            first_error: (组号, 组内行, 列) 或 None
+        """
+        result = np.asarray(result)
+        n_chunks = result.shape[0] // self.rows_per_chunk
+        total_errors = 0
+        first_error = None
+        for offset, chunk in enumerate(self.iter_chunks(n_chunks, start)):
+            rows = slice(offset * self.rows_per_chunk, (offset + 1) * self.rows_per_chunk)
+            mismatch = result[rows] != getattr(chunk, field)
+            count = int(np.count_nonzero(mismatch))
+            if count and first_error is None:
+                row, col = np.argwhere(mismatch)[0]
+                first_error = (chunk.index, int(row), int(col))
+            total_errors += count
+        return total_errors, first_error
@@ -0,0 +1,122 @@
+#!/usr/bin/python3
+# coding=utf-8
+# ===============================================================================
+# 零拷贝帧数据源
+#
+# 以 np.memmap 只读映射 x1_gm.bin / golden.bin 等 [行数, 行长] 的帧文件，
+# 按 256 行一组 (chunk) 提供视图。请求的组数超过文件中的组数时按环形
+# 循环取用 (第 i 组对应文件中第 i % 文件组数 组)，Host 侧不产生任何复制，
+# 组数从 12 扩到上百时 Host 内存占用保持为一个文件映射的大小。
+# 文件不足一组时 (如短 golden / 输入文件) 把文件内容循环铺满首组，
+# 与原 load_bin_with_tiling 的 np.tile 行为一致，此时只占一组大小的内存
+# ===============================================================================
+
+import os
+
+import numpy as np
+
+ROWS_PER_CHUNK = 256
+
+
+class FrameSource:
+    """
+    帧文件的内存映射视图
+
+    Args:
+        path: 二进制帧文件路径
+        dtype: 元素类型 (如 np.int8 / np.int16)
+        row_len: 每行元素数 (码长或信息位长)
+        rows_per_chunk: 每组行数，与算子单次处理的 256 行一致
+    """
+
+    def __init__(self, path, dtype, row_len, rows_per_chunk=ROWS_PER_CHUNK):
+        self.path = path
+        self.dtype = np.dtype(dtype)
+        self.row_len = int(row_len)
+        self.rows_per_chunk = int(rows_per_chunk)
+
+        n_elements = os.path.getsize(path) // self.dtype.itemsize
+        if n_elements == 0:
+            raise ValueError(f"{path} is empty")
+        n_rows = n_elements // self.row_len
+        self.n_file_chunks = n_rows // self.rows_per_chunk
+        if self.n_file_chunks == 0:
+            # 不足一组: 按元素循环复制铺满一组
+            self.n_file_chunks = 1
+            self.frames = np.resize(np.fromfile(path, dtype=self.dtype), self.chunk_shape)
+            self.frames.flags.writeable = False
+            return
+        # 尾部不足一组的行不参与循环
+        self.frames = np.memmap(path, dtype=self.dtype, mode='r',
+                                shape=(self.n_file_chunks * self.rows_per_chunk, self.row_len))
+
+    @property
+    def chunk_shape(self):
+        return (self.rows_per_chunk, self.row_len)
+
+    def chunk(self, index):
+        """第 index 组 [rows_per_chunk, row_len] 的只读视图 (环形取用)"""
+        start = (index % self.n_file_chunks) * self.rows_per_chunk
+        return self.frames[start:start + self.rows_per_chunk]
+
+    def iter_chunks(self, n_chunks, start=0):
+        """依次产出 n_chunks 个组视图"""
+        for index in range(start, start + n_chunks):
+            yield self.chunk(index)
+
+    def ring_view(self, n_chunks):
+        """
+        [n_chunks, rows_per_chunk, row_len] 的环形跨步视图，不分配内存
+
+        文件只有一组时用 0 跨步重复该组; 文件组数 >= n_chunks 时直接截取前 n_chunks 组。
+        其他情况 (多组文件循环多遍) 无法用单个跨步视图表达，请使用 iter_chunks
+        """
+        chunk_stride = self.frames.strides[0] * self.rows_per_chunk
+        if self.n_file_chunks == 1:
+            chunk_stride = 0
+        elif n_chunks > self.n_file_chunks:
+            raise ValueError(f"ring_view over {self.n_file_chunks} file chunks cannot repeat; use iter_chunks")
+        return np.lib.stride_tricks.as_strided(
+            self.frames, shape=(n_chunks,) + self.chunk_shape,
+            strides=(chunk_stride,) + self.frames.strides, writeable=False)
+
+    def to_tensor(self, n_chunks, device):
+        """
+        在 device 上分配 [n_chunks * rows_per_chunk, row_len] 的连续张量，逐组从映射视图拷入，
+        Host 侧只经过单组大小的临时缓冲
+        """
+        import torch
+
+        out = None
+        for index, view in enumerate(self.iter_chunks(n_chunks)):
+            # 映射为只读，torch.from_numpy 需要可写数组，这里只复制单组
+            host = torch.from_numpy(np.array(view))
+            if out is None:
+                out = torch.empty((n_chunks * self.rows_per_chunk, self.row_len), dtype=host.dtype, device=device)
+            start = index * self.rows_per_chunk
+            out[start:start + self.rows_per_chunk].copy_(host)
+        return out
+
+    def compare(self, result, n_chunks=None):
+        """
+        逐组对比结果与本数据源 (作 golden)，不展开 golden
+        Args:
+            result: [n_chunks * rows_per_chunk, row_len] 数组
+        Returns:
+            total_errors: 不一致元素总数
+            first_error: (组号, 组内行, 列) 或 None
+        """
+        result = np.asarray(result)
+        if n_chunks is None:
+            n_chunks = result.shape[0] // self.rows_per_chunk
+        total_errors = 0
+        first_error = None
+        for index, golden in enumerate(self.iter_chunks(n_chunks)):
+            start = index * self.rows_per_chunk
+            mismatch = result[start:start + self.rows_per_chunk] != golden
+            count = int(np.count_nonzero(mismatch))
+            if count and first_error is None:
+                row, col = np.argwhere(mismatch)[0]
+                first_error = (index, int(row), int(col))
+            total_errors += count
+        return total_errors, first_error
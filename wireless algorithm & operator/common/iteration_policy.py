@@ -0,0 +1,56 @@
+#!/usr/bin/python3
+# coding=utf-8
+# ===============================================================================
+# 比特翻转译码的自适应迭代预算 (Host 侧策略)
+#
+# 根据最近若干批的 ConvergenceStats 维护一个指数衰减的迭代次数直方图，
+# 选取能覆盖 target_coverage 比例帧的最小迭代次数再加 margin 作为下一批的 max_iter。
+# 在预算内未收敛的帧按 "需要上限次" 计入，信道变差时预算会自动回升到上限;
+# 初始即满足全部校验的帧 (包括调度器补齐的全 0 帧) 不计入
+# ===============================================================================
+
+import numpy as np
+
+from ldpc_bitflip import DEFAULT_MAX_ITER
+
+
+class AdaptiveIterationPolicy:
+    """
+    Args:
+        max_iter_cap: 迭代预算上限 (与 Kernel 的 MAX_ITER 一致)
+        min_iter: 迭代预算下限
+        target_coverage: 期望在预算内收敛的帧比例
+        margin: 在统计得到的迭代次数上额外增加的余量
+        decay: 历史直方图的衰减系数，越小越偏向最近的批次
+    """
+
+    def __init__(self, max_iter_cap=DEFAULT_MAX_ITER, min_iter=1, target_coverage=0.999, margin=1, decay=0.9):
+        if not 0 < target_coverage <= 1:
+            raise ValueError("target_coverage must be in (0, 1]")
+        self.max_iter_cap = int(max_iter_cap)
+        self.min_iter = int(min_iter)
+        self.target_coverage = target_coverage
+        self.margin = int(margin)
+        self.decay = decay
+        self._hist = np.zeros(self.max_iter_cap + 1, dtype=np.float64)
+        self.max_iter = self.max_iter_cap
+
+    def update(self, stats):
+        """并入一批译码的 ConvergenceStats，返回更新后的 max_iter"""
+        converged = stats.converged
+        decoded = converged & (stats.iterations > 0)
+        hist = np.bincount(np.minimum(stats.iterations[decoded], self.max_iter_cap),
+                           minlength=self.max_iter_cap + 1).astype(np.float64)
+        hist[self.max_iter_cap] += np.count_nonzero(~converged)
+        self._hist = self.decay * self._hist + hist
+        self.max_iter = self.recommend()
+        return self.max_iter
+
+    def recommend(self):
+        """覆盖 target_coverage 比例帧所需的迭代次数 + margin，限制在 [min_iter, max_iter_cap]"""
+        total = self._hist.sum()
+        if total == 0:
+            return self.max_iter_cap
+        coverage = np.cumsum(self._hist) / total
+        needed = int(np.searchsorted(coverage, self.target_coverage - 1e-12))
+        return int(np.clip(needed + self.margin, self.min_iter, self.max_iter_cap))
@@ -0,0 +1,150 @@
+#!/usr/bin/python3
+# coding=utf-8
+# ===============================================================================
+# 任意帧数的 LDPC 批处理调度
+#
+# 算子一次处理 256 行 (一个 tile)，绑定层一次发射若干 tile。调度器把任意
+# 帧数切成 256 行的 tile，尾部不足一个 tile 的部分补 0 帧 (全 0 码字满足全部
+# 校验，译码即刻收敛)，结果去掉补齐行后原位写入输出数组。
+#
+# 后端:
+#   cpu: NumPy 参考实现 (bitflip_decode / PackedEncoder)，无需设备即可测试
+#   npu: ldpc_custom.run_ldpc_decode / ldpc_encode_custom.run_ldpc_encode
+# ===============================================================================
+
+import numpy as np
+
+from gf2_packed import PackedCheckMatrix, PackedEncoder
+from ldpc_bitflip import DEFAULT_MAX_ITER, bitflip_decode
+
+TILE_ROWS = 256
+
+
+class BatchScheduler:
+    """
+    按 tile 切分、补齐、发射、去补齐的通用调度器
+
+    Args:
+        launch: callable，输入 [n_tiles * tile_rows, in_cols] 的一批 tile，返回同行数的结果
+                (可原地修改输入并返回它)
+        out_cols: 每帧输出长度
+        out_dtype: 输出类型
+        tile_rows: 每个 tile 的行数
+        max_tiles: 每次发射最多的 tile 数，None 表示一次发射全部
+    """
+
+    def __init__(self, launch, out_cols, out_dtype, tile_rows=TILE_ROWS, max_tiles=None):
+        self.launch = launch
+        self.out_cols = int(out_cols)
+        self.out_dtype = np.dtype(out_dtype)
+        self.tile_rows = int(tile_rows)
+        self.max_tiles = max_tiles
+        # 上一次 run 的每次发射行数与补齐行数，便于统计浪费
+        self.launch_rows = []
+        self.padding_rows = 0
+
+    def run(self, frames, out=None):
+        """
+        Args:
+            frames: [M, in_cols]，M 任意
+            out: 可选的 [M, out_cols] 输出数组，结果原位写入
+        Returns:
+            out: [M, out_cols]
+        """
+        frames = np.asarray(frames)
+        n_frames = frames.shape[0]
+        if out is None:
+            out = np.empty((n_frames, self.out_cols), dtype=self.out_dtype)
+        self.launch_rows = []
+        self.padding_rows = 0
+        if n_frames == 0:
+            return out
+
+        n_tiles = -(-n_frames // self.tile_rows)
+        tiles_per_launch = n_tiles if self.max_tiles is None else min(self.max_tiles, n_tiles)
+        rows_per_launch = tiles_per_launch * self.tile_rows
+        # 复用同一个暂存缓冲，尾部补齐行清零
+        staging = np.empty((rows_per_launch, frames.shape[1]), dtype=frames.dtype)
+
+        for start in range(0, n_frames, rows_per_launch):
+            count = min(rows_per_launch, n_frames - start)
+            padded = -(-count // self.tile_rows) * self.tile_rows
+            staging[:count] = frames[start:start + count]
+            staging[count:padded] = 0
+            result = self.launch(staging[:padded])
+            out[start:start + count] = np.asarray(result)[:count]
+            self.launch_rows.append(padded)
+        self.padding_rows = sum(self.launch_rows) - n_frames
+        return out
+
+    __call__ = run
+
+
+def _npu_launch(binding, h_matrix, device, in_place):
+    """把 NumPy tile 批搬到设备，调用绑定，取回结果"""
+    import torch
+
+    h_tensor = torch.from_numpy(np.ascontiguousarray(h_matrix, dtype=np.int8)).to(device)
+
+    def launch(tiles):
+        bits = torch.from_numpy(np.ascontiguousarray(tiles, dtype=np.int8)).to(device)
+        result = binding(bits, h_tensor)
+        return (bits if in_place else result).cpu().numpy()
+    return launch
+
+
+def make_decoder(H_transposed, backend="cpu", max_iter=DEFAULT_MAX_ITER, device="npu:0", max_tiles=None,
+                 policy=None):
+    """
+    任意帧数的比特翻转译码调度器
+    Args:
+        H_transposed: [N, K] 的 H^T (即 x2_gm)
+        backend: "cpu" 或 "npu"
+        max_iter: cpu 后端的迭代次数 (npu 后端由 Kernel 内 MAX_ITER 决定)
+        policy: 可选的 AdaptiveIterationPolicy，cpu 后端每次发射使用 policy.max_iter 并用收敛统计更新它。
+            npu 后端的迭代次数固定为 Kernel 内 MAX_ITER，run_ldpc_decode_stats 也只给出每核校验子重量、
+            没有逐帧迭代次数，无法驱动该策略，因此不支持
+    Returns:
+        BatchScheduler，调用 scheduler(bits) 得到 [M, N] int8
+    """
+    H_transposed = np.asarray(H_transposed)
+    if backend == "cpu":
+        engine = PackedCheckMatrix(H_transposed)
+
+        def launch(tiles):
+            if policy is None:
+                return bitflip_decode(tiles, engine, max_iter=max_iter)
+            decoded, stats = bitflip_decode(tiles, engine, max_iter=policy.max_iter, return_stats=True)
+            policy.update(stats)
+            return decoded
+    elif backend == "npu":
+        if policy is not None:
+            raise ValueError("policy is only supported on the cpu backend (npu iterations are fixed by MAX_ITER)")
+        import ldpc_custom
+        launch = _npu_launch(ldpc_custom.run_ldpc_decode, H_transposed, device, in_place=True)
+    else:
+        raise ValueError(f"unknown backend: {backend}")
+    return BatchScheduler(launch, H_transposed.shape[0], np.int8, max_tiles=max_tiles)
+
+
+def make_encoder(G_matrix, backend="cpu", device="npu:0", max_tiles=None):
+    """
+    任意帧数的编码调度器
+    Args:
+        G_matrix: [K, N] 生成矩阵
+        backend: "cpu" 或 "npu"
+    Returns:
+        BatchScheduler，调用 scheduler(msgs) 得到 [M, N] int16 (与 golden.bin 一致)
+    """
+    G_matrix = np.asarray(G_matrix)
+    if backend == "cpu":
+        encoder = PackedEncoder(G_matrix)
+
+        def launch(tiles):
+            return encoder.encode(tiles, dtype=np.int16)
+    elif backend == "npu":
+        import ldpc_encode_custom
+        launch = _npu_launch(ldpc_encode_custom.run_ldpc_encode, G_matrix, device, in_place=False)
+    else:
+        raise ValueError(f"unknown backend: {backend}")
+    return BatchScheduler(launch, G_matrix.shape[1], np.int16, max_tiles=max_tiles)
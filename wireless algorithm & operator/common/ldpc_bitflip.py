@@ -0,0 +1,233 @@
+#!/usr/bin/python3
+# coding=utf-8
+# ===============================================================================
+# LDPC 硬判决比特翻转译码 CPU 参考实现 (批量向量化)
+#
+# 与 LDPCDec_loopInKernel.cpp 中的 Kernel 逻辑逐比特一致:
+#   1. S = (U x H^T) mod 2
+#   2. 行校验和为 0 的帧跳过 (冻结)
+#   3. Votes = S x H
+#   4. Votes == max(Votes) 且 max > 0 的比特翻转
+#
+# bitflip_decode_incremental 在迭代间保留校验子与投票，每次翻转后只更新
+# 与翻转比特相邻的校验节点及其变量节点，结果与 bitflip_decode 逐比特一致
+#
+# return_stats=True 时额外返回 ConvergenceStats: 每帧迭代次数、剩余校验子重量与迭代直方图
+# ===============================================================================
+
+import numpy as np
+
+import bit_format
+from tanner_graph import TannerGraph
+
+# 与 Kernel 中 MAX_ITER 保持一致
+DEFAULT_MAX_ITER = 20
+
+
+class DenseCheckMatrix:
+    """
+    稠密校验矩阵引擎，0/1 矩阵乘累加值不超过 N，float32 可精确表示且能走 BLAS
+
+    Args:
+        H_transposed: [N, K], 校验矩阵 H^T (即 x2_gm)
+    """
+
+    def __init__(self, H_transposed):
+        self.Ht = np.ascontiguousarray(H_transposed, dtype=np.float32)
+        self.H = np.ascontiguousarray(self.Ht.T)
+        self.n_vars, self.n_checks = self.Ht.shape
+
+    def syndrome(self, bits):
+        """[M, N] 0/1 码字 -> [M, K] uint8 校验子"""
+        return ((bits.astype(np.float32) @ self.Ht).astype(np.int32) & 1).astype(np.uint8)
+
+    def votes(self, syndromes):
+        """[M, K] 0/1 校验子 -> [M, N] int32 投票数"""
+        return (syndromes.astype(np.float32) @ self.H).astype(np.int32)
+
+
+class ConvergenceStats:
+    """
+    每帧收敛统计
+
+    Args:
+        iterations: [M] 每帧实际执行的翻转轮数 (初始即满足全部校验为 0)
+        residual_weight: [M] 译码结束时未满足的校验方程个数
+        max_iter: 本次译码的迭代预算
+    """
+
+    def __init__(self, iterations, residual_weight, max_iter):
+        self.iterations = np.asarray(iterations, dtype=np.int32)
+        self.residual_weight = np.asarray(residual_weight, dtype=np.int32)
+        self.max_iter = int(max_iter)
+
+    @property
+    def converged(self):
+        return self.residual_weight == 0
+
+    def histogram(self):
+        """[max_iter + 1] 已收敛帧按迭代次数的分布，下标为迭代次数"""
+        return np.bincount(self.iterations[self.converged], minlength=self.max_iter + 1)
+
+    def summary(self):
+        n_frames = self.iterations.size
+        n_converged = int(self.converged.sum())
+        mean_iter = float(self.iterations.mean()) if n_frames else 0.0
+        return (f"converged {n_converged}/{n_frames}, mean iter {mean_iter:.2f}, "
+                f"max iter {int(self.iterations.max(initial=0))}, "
+                f"residual syndrome weight {int(self.residual_weight.sum())}")
+
+
+def as_check_engine(H):
+    """
+    统一校验矩阵入口: 已实现 syndrome()/votes() 的对象 (如 PackedCheckMatrix)
+    直接返回，否则视为 [N, K] 的 H^T 数组包装为 DenseCheckMatrix
+    """
+    if hasattr(H, "syndrome") and hasattr(H, "votes"):
+        return H
+    return DenseCheckMatrix(H)
+
+
+def bitflip_decode(received_bits, H_transposed, max_iter=DEFAULT_MAX_ITER, return_stats=False):
+    """
+    批量比特翻转译码，整批帧以矩阵运算完成 max-vote / compare / XOR
+
+    Args:
+        received_bits: [M, N], 接收到的 0/1 硬判决比特
+        H_transposed: [N, K] 的 H^T (即 x2_gm)，或 as_check_engine 支持的校验矩阵引擎
+        max_iter: 最大迭代次数
+        return_stats: 是否同时返回 ConvergenceStats
+    Returns:
+        decoded_bits: [M, N] int8, 译码后的结果
+        stats: ConvergenceStats (仅 return_stats=True 时)
+    """
+    bits = np.array(received_bits, dtype=np.uint8)
+    engine = as_check_engine(H_transposed)
+    iterations = np.zeros(bits.shape[0], dtype=np.int32)
+
+    # 仍未满足全部校验方程的帧索引，校验和为 0 的帧不再参与计算
+    active = np.arange(bits.shape[0])
+
+    for _ in range(max_iter):
+        # 1. 校验子计算 (只算活跃帧)
+        cur = bits[active]
+        syndromes = engine.syndrome(cur)
+
+        # 2. 冻结已收敛的帧
+        unsat = syndromes.any(axis=1)
+        active = active[unsat]
+        if active.size == 0:
+            break
+        cur = cur[unsat]
+        syndromes = syndromes[unsat]
+
+        # 3. 投票
+        votes = engine.votes(syndromes)
+
+        # 4. 翻转: 票数等于行最大值且最大值 > 0
+        max_votes = votes.max(axis=1, keepdims=True)
+        flip_mask = (votes == max_votes) & (max_votes > 0)
+        bits[active] = cur ^ flip_mask.astype(np.uint8)
+        iterations[active] += 1
+
+    if not return_stats:
+        return bits.astype(np.int8)
+    # 循环结束时仍在活跃集中的帧补算一次校验子，其余帧已确认收敛
+    residual = np.zeros(bits.shape[0], dtype=np.int32)
+    if active.size:
+        residual[active] = engine.syndrome(bits[active]).sum(axis=1, dtype=np.int32)
+    return bits.astype(np.int8), ConvergenceStats(iterations, residual, max_iter)
+
+
+def bitflip_decode_packed(received_packed, H_transposed, max_iter=DEFAULT_MAX_ITER):
+    """
+    打包比特交换格式 (bit_format) 的比特翻转译码
+    Args:
+        received_packed: [M, ceil(N/8)] uint8 打包的接收比特
+    Returns:
+        [M, ceil(N/8)] uint8 打包的译码结果
+    """
+    engine = as_check_engine(H_transposed)
+    bits = bit_format.unpack(received_packed, engine.n_vars)
+    return bit_format.pack(bitflip_decode(bits, engine, max_iter=max_iter))
+
+
+def _as_graph(H):
+    """TannerGraph / QCCode / CodeProfile 转为 TannerGraph，数组视为 [N, K] 的 H^T"""
+    if isinstance(H, TannerGraph):
+        return H
+    for method in ("tanner_graph", "to_tanner_graph"):
+        if hasattr(H, method):
+            return getattr(H, method)()
+    return TannerGraph.from_transposed(H)
+
+
+def bitflip_decode_incremental(received_bits, H, max_iter=DEFAULT_MAX_ITER, return_stats=False):
+    """
+    增量式比特翻转译码: 校验子和投票只在第一次迭代前完整计算一次，
+    之后每翻转一个比特，只翻转它所连接的校验节点的校验子，
+    并对校验子发生变化的校验节点所连接的变量节点投票 +1 / -1
+
+    Args:
+        received_bits: [M, N], 接收到的 0/1 硬判决比特
+        H: TannerGraph (或 QCCode / CodeProfile)，或 [N, K] 的 H^T (即 x2_gm)
+        max_iter: 最大迭代次数
+        return_stats: 是否同时返回 ConvergenceStats
+    Returns:
+        decoded_bits: [M, N] int8, 与 bitflip_decode 逐比特一致
+        flip_counts: [实际迭代次数] int64, 每次迭代翻转的比特总数
+        stats: ConvergenceStats (仅 return_stats=True 时)
+    """
+    graph = _as_graph(H)
+    bits = np.array(received_bits, dtype=np.uint8)
+    n_checks = graph.n_checks
+    var_degrees = graph.var_degrees
+    check_degrees = graph.check_degrees
+
+    active = np.arange(bits.shape[0])
+    syndromes = graph.syndrome(bits)
+    votes = graph.votes(syndromes)
+    flip_counts = []
+    iterations = np.zeros(bits.shape[0], dtype=np.int32)
+
+    for _ in range(max_iter):
+        # 冻结已收敛的帧
+        unsat = syndromes.any(axis=1)
+        if not unsat.all():
+            active = active[unsat]
+            syndromes = syndromes[unsat]
+            votes = votes[unsat]
+        if active.size == 0:
+            break
+
+        # 翻转: 票数等于行最大值且最大值 > 0
+        max_votes = votes.max(axis=1, keepdims=True)
+        frame_idx, var_pos = np.nonzero((votes == max_votes) & (max_votes > 0))
+        flip_counts.append(frame_idx.size)
+        bits[active[frame_idx], var_pos] ^= 1
+        iterations[active] += 1
+
+        # 翻转比特 -> 相邻校验节点，同一校验被翻转偶数次时校验子不变
+        degrees = var_degrees[var_pos]
+        edge_start = np.repeat(graph.var_ptr[var_pos] - np.cumsum(degrees) + degrees, degrees)
+        checks = graph.var_idx[edge_start + np.arange(degrees.sum())]
+        keys, counts = np.unique(np.repeat(frame_idx, degrees).astype(np.int64) * n_checks + checks,
+                                 return_counts=True)
+        keys = keys[counts & 1 == 1]
+        changed_frame, changed_check = np.divmod(keys, n_checks)
+        syndromes[changed_frame, changed_check] ^= 1
+
+        # 校验子由 0 变 1 的校验给相邻变量 +1，由 1 变 0 的 -1
+        delta = 2 * syndromes[changed_frame, changed_check].astype(np.int32) - 1
+        degrees = check_degrees[changed_check]
+        edge_start = np.repeat(graph.check_ptr[changed_check] - np.cumsum(degrees) + degrees, degrees)
+        neighbours = graph.check_idx[edge_start + np.arange(degrees.sum())]
+        np.add.at(votes, (np.repeat(changed_frame, degrees), neighbours), np.repeat(delta, degrees))
+
+    flip_counts = np.array(flip_counts, dtype=np.int64)
+    if not return_stats:
+        return bits.astype(np.int8), flip_counts
+    # 增量维护的校验子即为最终校验子，无需补算
+    residual = np.zeros(bits.shape[0], dtype=np.int32)
+    residual[active] = syndromes.sum(axis=1, dtype=np.int32)
+    return bits.astype(np.int8), flip_counts, ConvergenceStats(iterations, residual, max_iter)
@@ -0,0 +1,177 @@
+#!/usr/bin/python3
+# coding=utf-8
+# ===============================================================================
+# LDPC 多码注册表
+#
+# 每个码登记源文件 (alist / .qc)、有效尺寸、NPU 对齐后的 Padding 尺寸和默认
+# 迭代次数，矩阵本身由 code_profile 缓存按需加载。
+# 批处理接口按码名把混合码率的帧分组，每组只补齐到本码的 Padding 尺寸，
+# 而不是统一补齐到最大的码
+# ===============================================================================
+
+import os
+
+import numpy as np
+
+from code_profile import load_code_profile
+from ldpc_batch import make_decoder, make_encoder
+
+_OPERATOR_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+_DECODE_DIR = os.path.join(_OPERATOR_ROOT, "LDPC_Decode")
+
+# NPU 比特翻转 / 编码 Kernel 的 Tiling 固定为 256 x 512 (校验 x 码长)
+KERNEL_SHAPE = (256, 512)
+
+
+class CodeSpec:
+    """
+    注册表中的一个码
+
+    Args:
+        name: 码名
+        source: alist 或 .qc 文件路径
+        valid_shape: 有效 H 尺寸 (校验数, 码长)
+        padded_shape: Padding 后 H 尺寸 (校验数, 码长)，None 表示不补齐
+        max_iter: 默认比特翻转迭代次数
+        z: QC 码的循环置换块大小，None 表示非 QC 码
+    """
+
+    def __init__(self, name, source, valid_shape, padded_shape=None, max_iter=20, z=None):
+        self.name = name
+        self.source = source
+        self.valid_check_len, self.valid_code_len = valid_shape
+        self.padded_shape = tuple(padded_shape) if padded_shape is not None else None
+        self.n_checks, self.n_vars = self.padded_shape or valid_shape
+        self.max_iter = max_iter
+        self.z = z
+
+    @property
+    def valid_info_len(self):
+        return self.valid_code_len - self.valid_check_len
+
+    @property
+    def rate(self):
+        return self.valid_info_len / self.valid_code_len
+
+    def available(self):
+        return os.path.exists(self.source)
+
+    def __repr__(self):
+        return (f"CodeSpec({self.name}: {self.valid_check_len}x{self.valid_code_len} -> "
+                f"{self.n_checks}x{self.n_vars}, max_iter={self.max_iter})")
+
+
+CODE_REGISTRY = {}
+
+# 已加载的码配置与调度器
+_profiles = {}
+_schedulers = {}
+
+
+def register_code(name, source, valid_shape, padded_shape=None, max_iter=20, z=None):
+    """登记一个码，同名覆盖"""
+    CODE_REGISTRY[name] = CodeSpec(name, source, valid_shape, padded_shape, max_iter, z)
+    _profiles.pop(name, None)
+    for key in [k for k in _schedulers if k[0] == name]:
+        del _schedulers[key]
+    return CODE_REGISTRY[name]
+
+
+register_code("peg", os.path.join(_DECODE_DIR, "scripts", "PEGReg252x504.alist"), (252, 504), (256, 512))
+register_code("wimax", os.path.join(_DECODE_DIR, "Matrix", "WIMAX", "WIMAX_288_576.alist"), (288, 576), max_iter=50, z=24)
+# transLDPCQC.py 的输入文件，仓库中不附带，放入 scripts/ 后即可使用
+register_code("ar4ja", os.path.join(_DECODE_DIR, "scripts", "AR4JA_4096_8192.qc"), (4096, 8192))
+
+
+def get_code_spec(name):
+    if name not in CODE_REGISTRY:
+        raise KeyError(f"unknown LDPC code: {name} (registered: {', '.join(CODE_REGISTRY)})")
+    return CODE_REGISTRY[name]
+
+
+def get_profile(name):
+    """码名 -> CodeProfile (进程内缓存，底层为 mmap 的持久化缓存)"""
+    if name not in _profiles:
+        spec = get_code_spec(name)
+        if not spec.available():
+            raise FileNotFoundError(f"source of code {name} not found: {spec.source}")
+        profile = load_code_profile(spec.source, spec.padded_shape)
+        if (profile.valid_check_len, profile.valid_code_len) != (spec.valid_check_len, spec.valid_code_len):
+            raise ValueError(f"{spec.source} is {profile.valid_check_len}x{profile.valid_code_len}, "
+                             f"registry expects {spec.valid_check_len}x{spec.valid_code_len}")
+        _profiles[name] = profile
+    return _profiles[name]
+
+
+def group_frames(codes):
+    """每帧的码名 [M] -> {码名: 帧下标数组}，组内保持原顺序"""
+    codes = np.asarray(codes)
+    return {str(name): np.flatnonzero(codes == name) for name in dict.fromkeys(codes.tolist())}
+
+
+def _scheduler(name, kind, backend):
+    key = (name, kind, backend)
+    if key not in _schedulers:
+        profile = get_profile(name)
+        if backend == "npu" and (profile.n_checks, profile.n_vars) != KERNEL_SHAPE:
+            raise ValueError(f"code {name} ({profile.n_checks}x{profile.n_vars}) does not match "
+                             f"the NPU kernel shape {KERNEL_SHAPE}")
+        if kind == "decode":
+            _schedulers[key] = make_decoder(profile.H_transposed, backend=backend,
+                                            max_iter=get_code_spec(name).max_iter)
+        else:
+            _schedulers[key] = make_encoder(profile.G, backend=backend)
+    return _schedulers[key]
+
+
+def _stack(frames, idx, width, dtype):
+    """把一组变长帧按 width 补 0 堆叠"""
+    stacked = np.zeros((idx.size, width), dtype=dtype)
+    for row, i in enumerate(idx):
+        frame = np.asarray(frames[i])
+        stacked[row, :frame.shape[-1]] = frame
+    return stacked
+
+
+def decode_mixed(codes, frames, backend="cpu"):
+    """
+    混合码率批量译码
+    Args:
+        codes: [M] 每帧的码名
+        frames: M 个一维 0/1 数组，长度为该码的有效码长或 Padding 码长
+        backend: "cpu" 或 "npu"
+    Returns:
+        长度为 M 的列表，每帧译码结果 (int8，长度与输入相同)
+    """
+    results = [None] * len(frames)
+    for name, idx in group_frames(codes).items():
+        profile = get_profile(name)
+        decoded = _scheduler(name, "decode", backend)(_stack(frames, idx, profile.n_vars, np.int8))
+        for row, i in enumerate(idx):
+            results[i] = decoded[row, :np.asarray(frames[i]).shape[-1]]
+    return results
+
+
+def encode_mixed(codes, msgs, backend="cpu"):
+    """
+    混合码率批量编码
+    Args:
+        codes: [M] 每帧的码名
+        msgs: M 个一维 0/1 信息比特数组，长度为该码的有效信息位长
+    Returns:
+        长度为 M 的列表，每帧有效码长的码字 (int16)
+    """
+    results = [None] * len(msgs)
+    for name, idx in group_frames(codes).items():
+        profile = get_profile(name)
+        codewords = _scheduler(name, "encode", backend)(_stack(msgs, idx, profile.n_info, np.int8))
+        for row, i in enumerate(idx):
+            results[i] = codewords[row, :profile.valid_code_len]
+    return results
+
+
+if __name__ == "__main__":
+    for spec in CODE_REGISTRY.values():
+        status = "ok" if spec.available() else "source missing"
+        print(f"{spec.name:<8} {spec.valid_check_len}x{spec.valid_code_len} -> {spec.n_checks}x{spec.n_vars} "
+              f"rate={spec.rate:.3f} max_iter={spec.max_iter} [{status}]")
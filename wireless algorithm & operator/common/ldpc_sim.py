@@ -0,0 +1,263 @@
+#!/usr/bin/python3
+# coding=utf-8
+# ===============================================================================
+# LDPC 蒙特卡洛 BER / FER 仿真
+#
+# 在 ldpc_codes 注册表中的码 (PEG / WiMAX / AR4JA) 上扫描信道参数:
+#   awgn: BPSK + AWGN，扫描 Eb/N0 (dB)
+#   bsc:  二元对称信道，扫描交叉概率 p
+# 每个点把帧分批分发到进程池，误帧数达到目标、FER 置信区间足够窄
+# 或帧数达到上限时停止，输出 BER / FER 曲线与 frames/s 到 CSV
+# ===============================================================================
+
+import argparse
+import csv
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from code_profile import load_code_profile
+from gf2_packed import PackedCheckMatrix, PackedEncoder
+from ldpc_bitflip import DEFAULT_MAX_ITER, bitflip_decode
+from ldpc_codes import CODE_REGISTRY
+from ldpc_minsum import LayeredMinSumDecoder, bpsk_llr
+
+DECODERS = ("bitflip", "normalized", "offset")
+CHANNELS = ("awgn", "bsc")
+
+# 95% 置信度
+_Z_95 = 1.96
+
+# 每个工作进程内缓存的 (码配置, 译码器, 编码器)，避免每批重复构建
+_worker_cache = {}
+
+
+def _resolve_code(code):
+    """注册表中的码名或文件路径 -> (源文件, Padding 目标)"""
+    if code in CODE_REGISTRY:
+        spec = CODE_REGISTRY[code]
+        return spec.source, spec.padded_shape
+    return code, None
+
+
+def _resolve_max_iter(code, max_iter):
+    """未指定迭代次数时取注册表中该码的 max_iter (与 decode_mixed 一致)，文件路径取默认值"""
+    if max_iter is not None:
+        return max_iter
+    return CODE_REGISTRY[code].max_iter if code in CODE_REGISTRY else DEFAULT_MAX_ITER
+
+
+def _get_decoder(code, decoder_name):
+    key = (code, decoder_name)
+    if key not in _worker_cache:
+        source, pad_to = _resolve_code(code)
+        profile = load_code_profile(source, pad_to)
+        if decoder_name == "bitflip":
+            engine = PackedCheckMatrix(profile.H_transposed)
+        else:
+            engine = LayeredMinSumDecoder(profile.tanner_graph(), mode=decoder_name)
+        _worker_cache[key] = (profile, engine, PackedEncoder(profile.G))
+    return _worker_cache[key]
+
+
+def _channel(codewords, channel, point, rate, rng):
+    """
+    过信道，返回 (硬判决比特, 信道 LLR)
+    awgn: point 为 Eb/N0 (dB); bsc: point 为交叉概率
+    """
+    if channel == "awgn":
+        noise_var = 1.0 / (2 * rate * 10 ** (point / 10))
+        received = (1 - 2 * codewords.astype(np.float32)) + \
+            rng.normal(0, np.sqrt(noise_var), codewords.shape).astype(np.float32)
+        return (received < 0).astype(np.uint8), bpsk_llr(received, noise_var)
+
+    hard = codewords ^ (rng.random(codewords.shape) < point).astype(np.uint8)
+    magnitude = np.float32(np.log((1 - point) / point)) if 0 < point < 0.5 else np.float32(1e3)
+    return hard, np.where(hard == 1, -magnitude, magnitude).astype(np.float32)
+
+
+def simulate_batch(code, decoder_name, channel, point, n_frames, max_iter, seed):
+    """
+    仿真一批帧 (进程池任务)
+    Returns:
+        (帧数, 误帧数, 误比特数, 迭代次数之和, 译码耗时 s)
+    """
+    profile, engine, encoder = _get_decoder(code, decoder_name)
+    rng = np.random.default_rng(seed)
+    n_valid, k_valid = profile.valid_code_len, profile.valid_info_len
+
+    msgs = np.zeros((n_frames, profile.n_info), dtype=np.uint8)
+    msgs[:, :k_valid] = rng.integers(0, 2, (n_frames, k_valid))
+    codewords = encoder.encode(msgs)
+
+    # 只有有效码长上的比特经过信道，Padding 位置为已知的 0
+    hard = codewords.copy()
+    llr = np.full(codewords.shape, np.float32(1e3), dtype=np.float32)
+    hard[:, :n_valid], llr[:, :n_valid] = _channel(codewords[:, :n_valid], channel, point,
+                                                   k_valid / n_valid, rng)
+
+    start = time.perf_counter()
+    if decoder_name == "bitflip":
+        decoded = bitflip_decode(hard, engine, max_iter=max_iter)
+        iter_sum = 0
+    else:
+        decoded, iterations = engine.decode(llr, max_iter=max_iter)
+        iter_sum = int(iterations.sum())
+    elapsed = time.perf_counter() - start
+
+    bit_errors = (decoded[:, :n_valid] != codewords[:, :n_valid]).sum(axis=1)
+    return n_frames, int(np.count_nonzero(bit_errors)), int(bit_errors.sum()), iter_sum, elapsed
+
+
+def wilson_interval(errors, trials, z=_Z_95):
+    """误帧率的 Wilson 置信区间 (low, high)"""
+    if trials == 0:
+        return 0.0, 1.0
+    p = errors / trials
+    denom = 1 + z * z / trials
+    center = (p + z * z / (2 * trials)) / denom
+    half = z * np.sqrt(p * (1 - p) / trials + z * z / (4 * trials * trials)) / denom
+    return max(0.0, center - half), min(1.0, center + half)
+
+
+def run_point(pool, code, decoder_name, channel, point, max_iter=None, batch_frames=1024,
+              target_frame_errors=100, rel_ci=0.0, min_frames=0, max_frames=1_000_000, seed=0, workers=1):
+    """
+    仿真单个信道点，按批提交任务直到满足停止条件:
+      误帧数 >= target_frame_errors，或 FER 置信区间相对半宽 <= rel_ci (>0 时生效)，
+      或帧数 >= max_frames；min_frames 为至少仿真的帧数
+    max_iter 为 None 时取注册表中该码的迭代次数
+    Returns:
+        结果字典 (一行 CSV)
+    """
+    max_iter = _resolve_max_iter(code, max_iter)
+    # 信道点按 float64 位模式转为非负熵，Eb/N0 < 0 dB 的点同样可用，且与扫描顺序无关
+    seeds = np.random.SeedSequence([seed, int(np.float64(point).view(np.uint64))])
+    frames = frame_errors = bit_errors = iter_sum = 0
+    decode_time = 0.0
+    submitted = 0
+    pending = []
+    start = time.perf_counter()
+
+    def should_stop():
+        if frames < min_frames:
+            return False
+        if frame_errors >= target_frame_errors or frames >= max_frames:
+            return True
+        if rel_ci > 0 and frame_errors > 0:
+            low, high = wilson_interval(frame_errors, frames)
+            return (high - low) / 2 <= rel_ci * frame_errors / frames
+        return False
+
+    while True:
+        # 保持每个工作进程有两批任务在排队
+        while len(pending) < 2 * workers and submitted < max_frames:
+            n = min(batch_frames, max_frames - submitted)
+            pending.append(pool.submit(simulate_batch, code, decoder_name, channel, point, n,
+                                       max_iter, seeds.spawn(1)[0]))
+            submitted += n
+        if not pending:
+            break
+        n, fe, be, it, t = pending.pop(0).result()
+        frames += n
+        frame_errors += fe
+        bit_errors += be
+        iter_sum += it
+        decode_time += t
+        if should_stop():
+            break
+
+    for future in pending:
+        future.cancel()
+    wall = time.perf_counter() - start
+
+    source, pad_to = _resolve_code(code)
+    profile = load_code_profile(source, pad_to)
+    low, high = wilson_interval(frame_errors, frames)
+    return {
+        "code": code,
+        "decoder": decoder_name,
+        "channel": channel,
+        "point": point,
+        "frames": frames,
+        "frame_errors": frame_errors,
+        "bit_errors": bit_errors,
+        "fer": frame_errors / frames,
+        "ber": bit_errors / (frames * profile.valid_code_len),
+        "fer_ci_low": low,
+        "fer_ci_high": high,
+        "avg_iter": iter_sum / frames if decoder_name != "bitflip" else "",
+        "frames_per_s": frames / wall,
+        "decode_frames_per_s": frames / decode_time if decode_time > 0 else 0.0,
+    }
+
+
+def run_sweep(code, decoder_name, channel, points, workers=None, output=None, **point_kwargs):
+    """
+    扫描一组信道点，逐点打印并写入 CSV
+    Args:
+        points: awgn 为 Eb/N0 (dB) 列表，bsc 为交叉概率列表
+        workers: 进程数，默认 CPU 核数
+        output: CSV 文件路径，None 时只打印
+        point_kwargs: 透传给 run_point 的停止条件等参数
+    """
+    if decoder_name not in DECODERS:
+        raise ValueError(f"unknown decoder: {decoder_name}")
+    if channel not in CHANNELS:
+        raise ValueError(f"unknown channel: {channel}")
+    workers = workers or os.cpu_count() or 1
+
+    # 主进程先生成码配置缓存，工作进程只做 mmap 加载
+    source, pad_to = _resolve_code(code)
+    load_code_profile(source, pad_to)
+
+    label = "Eb/N0(dB)" if channel == "awgn" else "p"
+    print(f"{code} / {decoder_name} / {channel}, workers={workers}")
+    print(f"{label:<10} {'Frames':<10} {'FErr':<8} {'FER':<12} {'BER':<12} {'Avg Iter':<10} {'frames/s':<10}")
+    print("-" * 76)
+
+    rows = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for point in points:
+            row = run_point(pool, code, decoder_name, channel, point, workers=workers, **point_kwargs)
+            rows.append(row)
+            avg_iter = f"{row['avg_iter']:.2f}" if row["avg_iter"] != "" else "-"
+            print(f"{point:<10g} {row['frames']:<10} {row['frame_errors']:<8} {row['fer']:<12.3e} "
+                  f"{row['ber']:<12.3e} {avg_iter:<10} {row['frames_per_s']:<10.1f}")
+
+    if output:
+        with open(output, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0].keys()))
+            writer.writeheader()
+            writer.writerows(rows)
+        print(f"结果已写入 {output}")
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LDPC BER/FER Monte-Carlo simulation")
+    parser.add_argument("--code", default="peg", help="注册表码名 (peg / wimax / ar4ja) 或 alist / .qc 文件路径")
+    parser.add_argument("--decoder", default="bitflip", choices=DECODERS)
+    parser.add_argument("--channel", default="awgn", choices=CHANNELS)
+    parser.add_argument("--points", type=float, nargs="+", default=[1.0, 2.0, 3.0, 4.0, 5.0],
+                        help="awgn: Eb/N0 (dB)，可为负 (如 --points -2 -1 0)；bsc: 交叉概率")
+    parser.add_argument("--max-iter", type=int, default=None, help="默认取注册表中该码的迭代次数 (文件路径为 20)")
+    parser.add_argument("--batch-frames", type=int, default=1024)
+    parser.add_argument("--target-errors", type=int, default=100, help="每点目标误帧数")
+    parser.add_argument("--rel-ci", type=float, default=0.0, help="FER 95%% 置信区间相对半宽达到该值即停止")
+    parser.add_argument("--min-frames", type=int, default=0)
+    parser.add_argument("--max-frames", type=int, default=1_000_000)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=None, help="CSV 输出路径")
+    args = parser.parse_args()
+
+    run_sweep(args.code, args.decoder, args.channel, args.points, workers=args.workers, output=args.output,
+              max_iter=args.max_iter, batch_frames=args.batch_frames, target_frame_errors=args.target_errors,
+              rel_ci=args.rel_ci, min_frames=args.min_frames, max_frames=args.max_frames, seed=args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+#!/usr/bin/python3
+# coding=utf-8
+# ===============================================================================
+# 多线程 CPU QAM 调制 / 解调后端
+#
+# 符号数组按 chunk_symbols (默认 16384，与 qam_stream 一致) 分组，由线程池并行
+# 处理，各组结果直接写入共享的预分配输出的对应区间。组内的比较、查表、类型
+# 转换都是 NumPy 的整段运算，执行期间释放 GIL，吞吐随核数扩展。
+# 用作与 NPU (blockDim = 8) 对比的多核 CPU 基线，以及 NPU 繁忙时的回退路径
+#
+# 打包输出时组长对齐到整字节，结果与单线程 Constellation 逐字节一致
+# ===============================================================================
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+import bit_format
+from qam import get_constellation
+from qam_stream import CHUNK_SYMBOLS
+
+
+class ParallelQam:
+    """
+    Args:
+        order, labeling: 星座 (见 qam.Constellation)
+        workers: 线程数，默认 CPU 核数
+        chunk_symbols: 每个任务的符号数
+    线程池常驻，可用 with 语句或 close() 释放
+    """
+
+    def __init__(self, order=64, labeling="binary", workers=None, chunk_symbols=CHUNK_SYMBOLS):
+        self.constellation = get_constellation(order, labeling)
+        self.bits_per_symbol = self.constellation.bits_per_symbol
+        self.workers = workers or os.cpu_count() or 1
+        # 打包时每组比特数为 8 的倍数
+        align = 8 // np.gcd(8, self.bits_per_symbol)
+        self.chunk_symbols = max(align, chunk_symbols // align * align)
+        self._pool = ThreadPoolExecutor(max_workers=self.workers)
+
+    def close(self):
+        self._pool.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _run(self, n_symbols, task):
+        """把 [0, n_symbols) 按组分给线程池，task(start, stop) 写入各自的输出区间"""
+        starts = range(0, n_symbols, self.chunk_symbols)
+        # list() 等待全部完成并抛出任务中的异常
+        list(self._pool.map(lambda s: task(s, min(s + self.chunk_symbols, n_symbols)), starts))
+
+    def hard_demap(self, real, imag, packed=False, levels=None, out=None):
+        """
+        Args:
+            real, imag: [S] 接收符号的 I / Q 分量
+            packed: 为 True 时输出 bit_format 打包字节
+            levels: 硬判决电平，None 为星座默认电平
+            out: 预分配输出，None 时新建
+        Returns:
+            [m * S] uint8 比特流，或 [ceil(m * S / 8)] 打包字节
+        """
+        real = np.ravel(real)
+        imag = np.ravel(imag)
+        m = self.bits_per_symbol
+        n_out = bit_format.packed_len(real.size * m) if packed else real.size * m
+        if out is None:
+            out = np.empty(n_out, dtype=np.uint8)
+
+        def task(start, stop):
+            lo, hi = start * m, stop * m
+            if packed:
+                lo, hi = lo // 8, bit_format.packed_len(hi)
+            out[lo:hi] = self.constellation.hard_demap(real[start:stop], imag[start:stop], packed, levels)
+
+        self._run(real.size, task)
+        return out
+
+    def llr(self, real, imag, noise_var, dtype=np.float32, out=None):
+        """max-log LLR (见 MaxLogDemapper.llr)，返回 [m * S]"""
+        real = np.ravel(real)
+        imag = np.ravel(imag)
+        m = self.bits_per_symbol
+        if out is None:
+            out = np.empty(real.size * m, dtype=dtype)
+
+        def task(start, stop):
+            out[start * m:stop * m] = self.constellation.llr(real[start:stop], imag[start:stop], noise_var, dtype)
+
+        self._run(real.size, task)
+        return out
+
+    def modulate(self, bits, packed=False, n_symbols=None, dtype=np.float16, out_real=None, out_imag=None):
+        """
+        Args:
+            bits: [m * S] 0/1 比特流，或 packed=True 时 [ceil(m * S / 8)] 打包字节
+            n_symbols: 打包输入时的符号数 S
+            out_real, out_imag: 预分配输出，None 时新建
+        Returns:
+            (real, imag): 各 [S]
+        """
+        bits = np.ravel(bits)
+        m = self.bits_per_symbol
+        if n_symbols is None:
+            if packed:
+                raise ValueError("n_symbols is required for packed input")
+            n_symbols = bits.size // m
+        if out_real is None:
+            out_real = np.empty(n_symbols, dtype=dtype)
+        if out_imag is None:
+            out_imag = np.empty(n_symbols, dtype=dtype)
+
+        def task(start, stop):
+            if packed:
+                chunk = bits[start * m // 8:bit_format.packed_len(stop * m)]
+            else:
+                chunk = bits[start * m:stop * m]
+            out_real[start:stop], out_imag[start:stop] = self.constellation.modulate(
+                chunk, packed, stop - start, dtype)
+
+        self._run(n_symbols, task)
+        return out_real, out_imag
+
+
+def benchmark(n_symbols=1192 * 220, repeat=20, workers_list=None):
+    """1 .. N 线程的调制 / 硬解调 / 软解调吞吐，结果与单线程 Constellation 一致"""
+    import time
+
+    cpu_count = os.cpu_count() or 1
+    workers_list = workers_list or sorted({1, 2, 4, 8, cpu_count} & set(range(1, cpu_count + 1)))
+    rng = np.random.default_rng(0)
+    bits = rng.integers(0, 2, n_symbols * 6, dtype=np.uint8)
+    real, imag = rng.normal(0, 0.7, (2, n_symbols)).astype(np.float32)
+    modulator = get_constellation(64, "gray")
+    demapper = get_constellation(64, "binary")
+
+    ref_mod = modulator.modulate(bits)
+    ref_hard = demapper.hard_demap(real, imag)
+    ref_llr = demapper.llr(real, imag, 0.1)
+
+    def timed(fn):
+        fn()
+        start = time.perf_counter()
+        for _ in range(repeat):
+            fn()
+        return (time.perf_counter() - start) / repeat
+
+    print(f"{n_symbols} symbols, {cpu_count} CPUs")
+    for workers in workers_list:
+        with ParallelQam(64, "gray", workers) as par_mod, ParallelQam(64, "binary", workers) as par_demap:
+            mod_out = (np.empty(n_symbols, np.float16), np.empty(n_symbols, np.float16))
+            hard_out = np.empty(n_symbols * 6, np.uint8)
+            llr_out = np.empty(n_symbols * 6, np.float32)
+            mod_s = timed(lambda: par_mod.modulate(bits, out_real=mod_out[0], out_imag=mod_out[1]))
+            hard_s = timed(lambda: par_demap.hard_demap(real, imag, out=hard_out))
+            llr_s = timed(lambda: par_demap.llr(real, imag, 0.1, out=llr_out))
+            assert np.array_equal(mod_out[0], ref_mod[0]) and np.array_equal(mod_out[1], ref_mod[1])
+            assert np.array_equal(hard_out, ref_hard) and np.array_equal(llr_out, ref_llr)
+        print(f"  {workers:>2} threads: modulate {n_symbols / mod_s / 1e6:6.1f}  hard {n_symbols / hard_s / 1e6:6.1f}  "
+              f"llr {n_symbols / llr_s / 1e6:6.1f} Msym/s")
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,242 @@
+#!/usr/bin/python3
+# coding=utf-8
+# ===============================================================================
+# 有界内存的流式 QAM 解调
+#
+# I / Q 可以来自内存数组、np.memmap 映射的 .bin 文件，或逐段产出 (real, imag)
+# 的迭代器 (段长任意)。输入先整理为固定 chunk_symbols 个符号的组 (默认 16384，
+# 组内数据与中间量约数百 KB，落在 L2 内)，逐组硬判决 / 软解调后写入预先分配
+# 的输出 (数组或 memmap) 或 sink (文件对象 / 可调用对象)。常驻内存只有一组的数据，
+# 与流长度无关，几分钟的采集数据也可以在普通 Host 上解调
+#
+# 打包输出 (packed=True) 时组长取 4 的倍数，每组 6 * chunk_symbols 比特正好是
+# 整字节，逐组打包后拼接与整段一次性打包 (bit_format.pack) 逐字节一致
+# ===============================================================================
+
+import numpy as np
+
+import bit_format
+from qam import get_constellation
+
+CHUNK_SYMBOLS = 16384
+
+
+def open_iq_files(i_path, q_path, dtype=np.float32):
+    """以只读 memmap 打开 I / Q 两个 .bin 文件 (如 input_input_I.bin / input_input_Q.bin)"""
+    real = np.memmap(i_path, dtype=dtype, mode="r")
+    imag = np.memmap(q_path, dtype=dtype, mode="r")
+    if real.shape != imag.shape:
+        raise ValueError(f"I/Q length mismatch: {real.size} vs {imag.size}")
+    return real, imag
+
+
+def iter_array_chunks(real, imag, chunk_symbols=CHUNK_SYMBOLS):
+    """一维 I / Q 数组 (含 memmap) 按组切出视图，不复制整段数据"""
+    for start in range(0, len(real), chunk_symbols):
+        yield real[start:start + chunk_symbols], imag[start:start + chunk_symbols]
+
+
+def rechunk(chunks, chunk_symbols=CHUNK_SYMBOLS):
+    """
+    任意段长的 (real, imag) 迭代器 -> 固定 chunk_symbols 的组 (最后一组可以更短)，
+    只缓存不足一组的尾部。所有段统一为首段的精度 (与整段数组输入的判决结果一致)
+    """
+    dtype = None
+    filled = 0
+    for real, imag in chunks:
+        real = np.ravel(real)
+        imag = np.ravel(imag)
+        if dtype is None:
+            dtype = np.result_type(real, imag)
+            if not np.issubdtype(dtype, np.floating):
+                dtype = np.dtype(np.float64)
+            buf_real = np.empty(chunk_symbols, dtype=dtype)
+            buf_imag = np.empty(chunk_symbols, dtype=dtype)
+        real = real.astype(dtype, copy=False)
+        imag = imag.astype(dtype, copy=False)
+        pos = 0
+        while pos < real.size:
+            # 缓冲为空且剩余足够整组时直接切视图，不经过缓冲
+            if filled == 0 and real.size - pos >= chunk_symbols:
+                yield real[pos:pos + chunk_symbols], imag[pos:pos + chunk_symbols]
+                pos += chunk_symbols
+                continue
+            take = min(chunk_symbols - filled, real.size - pos)
+            buf_real[filled:filled + take] = real[pos:pos + take]
+            buf_imag[filled:filled + take] = imag[pos:pos + take]
+            filled += take
+            pos += take
+            if filled == chunk_symbols:
+                yield buf_real, buf_imag
+                filled = 0
+    if filled:
+        yield buf_real[:filled], buf_imag[:filled]
+
+
+class StreamingDemapper:
+    """
+    Args:
+        order, labeling: 星座 (默认与 QamDemapper 算子一致的 64-QAM Binary 映射)
+        chunk_symbols: 每组符号数
+        mode: "hard" 输出比特，"llr" 输出 max-log LLR
+        packed: 硬判决时输出 bit_format 打包字节
+        noise_var: mode="llr" 时的复噪声方差 N0
+        llr_dtype: LLR 输出类型
+        levels: 硬判决电平 (见 Constellation.hard_demap)，None 为星座默认电平
+    """
+
+    def __init__(self, order=64, labeling="binary", chunk_symbols=CHUNK_SYMBOLS, mode="hard",
+                 packed=False, noise_var=None, llr_dtype=np.float32, levels=None):
+        if mode not in ("hard", "llr"):
+            raise ValueError(f"unknown mode: {mode}")
+        if mode == "llr" and noise_var is None:
+            raise ValueError("noise_var is required for mode='llr'")
+        if packed and mode != "hard":
+            raise ValueError("packed output is only available for hard decisions")
+        self.constellation = get_constellation(order, labeling)
+        self.bits_per_symbol = self.constellation.bits_per_symbol
+        self.mode = mode
+        self.packed = packed
+        self.noise_var = noise_var
+        self.llr_dtype = np.dtype(llr_dtype)
+        self.levels = levels
+        # 打包时组边界对齐到整字节
+        align = 8 // np.gcd(8, self.bits_per_symbol) if packed else 1
+        self.chunk_symbols = max(align, chunk_symbols // align * align)
+
+    @property
+    def out_dtype(self):
+        return self.llr_dtype if self.mode == "llr" else np.dtype(np.uint8)
+
+    def out_len(self, n_symbols):
+        """n_symbols 个符号对应的输出元素数"""
+        n_values = n_symbols * self.bits_per_symbol
+        return bit_format.packed_len(n_values) if self.packed else n_values
+
+    def demap_chunk(self, real, imag):
+        """单组解调，返回一维输出"""
+        if self.mode == "llr":
+            return self.constellation.llr(real, imag, self.noise_var, self.llr_dtype)
+        return self.constellation.hard_demap(real, imag, self.packed, self.levels)
+
+    def run(self, source, out=None, sink=None):
+        """
+        Args:
+            source: (real, imag) 一维数组 / memmap 二元组，或产出 (real, imag) 段的迭代器
+            out: 预先分配的一维输出 (数组或 memmap)，长度至少 out_len(符号数)
+            sink: 未给出 out 时，逐组接收输出的文件对象 (write) 或可调用对象
+        Returns:
+            处理的符号数
+        """
+        if (out is None) == (sink is None):
+            raise ValueError("exactly one of out / sink is required")
+        if isinstance(source, tuple):
+            real, imag = source
+            if len(real) != len(imag):
+                raise ValueError(f"I/Q length mismatch: {len(real)} vs {len(imag)}")
+            chunks = iter_array_chunks(real, imag, self.chunk_symbols)
+        else:
+            chunks = rechunk(source, self.chunk_symbols)
+        write = sink if sink is None or callable(sink) else sink.write
+
+        n_symbols = 0
+        pos = 0
+        for real, imag in chunks:
+            result = self.demap_chunk(real, imag)
+            if out is not None:
+                if pos + result.size > len(out):
+                    raise ValueError(f"output of {len(out)} elements is too short for the stream")
+                out[pos:pos + result.size] = result
+            else:
+                write(memoryview(np.ascontiguousarray(result)).cast("B"))
+            pos += result.size
+            n_symbols += len(real)
+        return n_symbols
+
+    def run_files(self, i_path, q_path, out_path):
+        """I / Q .bin 文件 -> 输出 .bin 文件 (逐组写出)，返回符号数"""
+        real, imag = open_iq_files(i_path, q_path)
+        with open(out_path, "wb") as f:
+            return self.run((real, imag), sink=f)
+
+
+def check_iterator_path(chunk_symbols=CHUNK_SYMBOLS, rng=None):
+    """
+    迭代器输入 (不等长分段，float64，含紧贴判决门限的符号) 与整段 qam64_hard_demap 逐字节一致
+    """
+    from qam import decision_thresholds, qam64_hard_demap
+
+    rng = np.random.default_rng(0) if rng is None else rng
+    thresholds = decision_thresholds(get_constellation(64, "binary").levels, np.float64)
+    edges = np.concatenate([thresholds, np.nextafter(thresholds, -np.inf), np.nextafter(thresholds, np.inf)])
+    n_symbols = 2 * chunk_symbols + 123
+    real = rng.choice(edges, n_symbols)
+    imag = rng.choice(edges, n_symbols)
+    real[::3] = rng.normal(0, 0.7, real[::3].size)
+
+    cuts = [0, 100, 100 + chunk_symbols, n_symbols - 7, n_symbols]
+    segments = [(real[a:b], imag[a:b]) for a, b in zip(cuts[:-1], cuts[1:])]
+    for packed in (False, True):
+        demapper = StreamingDemapper(chunk_symbols=chunk_symbols, packed=packed)
+        out = np.empty(demapper.out_len(n_symbols), dtype=np.uint8)
+        demapper.run(iter(segments), out=out)
+        assert np.array_equal(out, qam64_hard_demap(real, imag, packed=packed))
+    print(f"iterator path ({len(segments)} float64 segments) == full-stream reference")
+
+
+def benchmark(n_symbols_list=(262240, 4 * 262240, 16 * 262240), chunk_symbols=CHUNK_SYMBOLS, workdir=None):
+    """
+    不同流长度下的流式解调: 与整段 qam64_hard_demap 逐字节一致，
+    tracemalloc 统计的峰值内存与流长度无关
+    """
+    import os
+    import tempfile
+    import time
+    import tracemalloc
+
+    from qam import qam64_hard_demap
+
+    rng = np.random.default_rng(0)
+    check_iterator_path(chunk_symbols, rng)
+    with tempfile.TemporaryDirectory(dir=workdir) as tmp:
+        i_path, q_path = os.path.join(tmp, "I.bin"), os.path.join(tmp, "Q.bin")
+        out_path = os.path.join(tmp, "out.bin")
+        for n_symbols in n_symbols_list:
+            # 按组写出随机 I / Q，生成过程本身也不占用整段内存
+            with open(i_path, "wb") as fi, open(q_path, "wb") as fq:
+                for start in range(0, n_symbols, 1 << 20):
+                    n = min(1 << 20, n_symbols - start)
+                    rng.normal(0, 0.7, n).astype(np.float32).tofile(fi)
+                    rng.normal(0, 0.7, n).astype(np.float32).tofile(fq)
+
+            for packed in (False, True):
+                demapper = StreamingDemapper(chunk_symbols=chunk_symbols, packed=packed)
+                tracemalloc.start()
+                start = time.perf_counter()
+                demapper.run_files(i_path, q_path, out_path)
+                seconds = time.perf_counter() - start
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+
+                # 只对首个长度做整段对比 (整段参考本身需要全量内存)
+                check = ""
+                if n_symbols == n_symbols_list[0]:
+                    real, imag = open_iq_files(i_path, q_path)
+                    ref = qam64_hard_demap(np.asarray(real), np.asarray(imag), packed=packed)
+                    assert np.array_equal(np.fromfile(out_path, dtype=np.uint8), ref)
+                    check = "  == full-stream reference"
+                print(f"{n_symbols:>9} symbols {'packed' if packed else 'bits  '}: "
+                      f"{seconds * 1000:8.1f} ms  {n_symbols / seconds / 1e6:6.1f} Msym/s  "
+                      f"peak {peak / 1e6:6.2f} MB{check}")
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) >= 4:
+        # python qam_stream.py I.bin Q.bin out.bin [packed]
+        packed = len(sys.argv) > 4 and sys.argv[4] == "packed"
+        n = StreamingDemapper(packed=packed).run_files(sys.argv[1], sys.argv[2], sys.argv[3])
+        print(f"demapped {n} symbols -> {sys.argv[3]}")
+    else:
+        benchmark()
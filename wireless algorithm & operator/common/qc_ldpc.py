@@ -0,0 +1,166 @@
+#!/usr/bin/python3
+# coding=utf-8
+# ===============================================================================
+# QC-LDPC 循环移位原生表示
+#
+# 码只保存基矩阵移位值 shifts [mb, nb] 与扩展因子 Z，-1 表示全零块。
+# 移位值为 s 的块是 Z x Z 单位阵循环右移 s 位:
+#   H[r*Z + i, c*Z + (i + s) % Z] = 1
+# 校验子、投票和编码都以 Z 长度块上的循环移位 (np.roll) 完成，
+# 稠密 H 只在显式调用 to_dense() 时展开
+# ===============================================================================
+
+import numpy as np
+
+from tanner_graph import TannerGraph
+
+
+def parse_qc_file(filepath):
+    """
+    解析 QC-LDPC 文件: 头部为 (块列数, 块行数, Z)，随后是 块行数 x 块列数 个移位值
+    Returns:
+        n_blk_rows, n_blk_cols, expansion_factor, shifts_grid
+    """
+    with open(filepath, 'r') as f:
+        content = f.read().split()
+
+    n_blk_cols = int(content[0])
+    n_blk_rows = int(content[1])
+    expansion_factor = int(content[2])
+
+    num_entries = n_blk_rows * n_blk_cols
+    shift_values = []
+    for val in content[3:]:
+        if len(shift_values) == num_entries:
+            break
+        try:
+            shift_values.append(int(val))
+        except ValueError:
+            pass  # 忽略非整数字符
+
+    if len(shift_values) != num_entries:
+        raise ValueError(f"文件格式错误：预期找到 {num_entries} 个移位值，但只找到 {len(shift_values)} 个。")
+
+    shifts_grid = np.array(shift_values, dtype=np.int32).reshape(n_blk_rows, n_blk_cols)
+    return n_blk_rows, n_blk_cols, expansion_factor, shifts_grid
+
+
+class QCCode:
+    """
+    QC-LDPC 码，实现 syndrome()/votes()，可直接传给 bitflip_decode
+
+    Args:
+        shifts: [mb, nb] 移位值，-1 为全零块
+        z: 扩展因子 Z
+    """
+
+    def __init__(self, shifts, z):
+        self.shifts = np.asarray(shifts, dtype=np.int32)
+        self.z = int(z)
+        self.n_blk_rows, self.n_blk_cols = self.shifts.shape
+        self.n_checks = self.n_blk_rows * self.z
+        self.n_vars = self.n_blk_cols * self.z
+        # 非零块列表 (块行, 块列, 移位)，按块行排序
+        rows, cols = np.nonzero(self.shifts >= 0)
+        self.blocks = [(int(r), int(c), int(self.shifts[r, c]) % self.z) for r, c in zip(rows, cols)]
+        self._encode_schedule = None
+
+    @classmethod
+    def from_qc_file(cls, filepath):
+        """由 .qc 文件构建"""
+        _, _, z, shifts = parse_qc_file(filepath)
+        return cls(shifts, z)
+
+    @property
+    def n_info(self):
+        return self.n_vars - self.n_checks
+
+    @property
+    def n_edges(self):
+        return len(self.blocks) * self.z
+
+    def _split(self, data, n_blocks):
+        data = np.asarray(data)
+        return data.reshape(data.shape[:-1] + (n_blocks, self.z))
+
+    def syndrome(self, bits):
+        """[M, N] 0/1 码字 -> [M, n_checks] uint8 校验子"""
+        u = self._split(np.asarray(bits, dtype=np.uint8), self.n_blk_cols)
+        s = np.zeros(u.shape[:-2] + (self.n_blk_rows, self.z), dtype=np.uint8)
+        for r, c, shift in self.blocks:
+            # s_r[i] ^= u_c[(i + shift) % Z]
+            s[..., r, :] ^= np.roll(u[..., c, :], -shift, axis=-1)
+        return s.reshape(s.shape[:-2] + (self.n_checks,))
+
+    def votes(self, syndromes):
+        """[M, n_checks] 0/1 校验子 -> [M, N] int32 投票数"""
+        s = self._split(np.asarray(syndromes, dtype=np.int32), self.n_blk_rows)
+        v = np.zeros(s.shape[:-2] + (self.n_blk_cols, self.z), dtype=np.int32)
+        for r, c, shift in self.blocks:
+            # v_c[j] += s_r[(j - shift) % Z]
+            v[..., c, :] += np.roll(s[..., r, :], shift, axis=-1)
+        return v.reshape(v.shape[:-2] + (self.n_vars,))
+
+    def to_dense(self):
+        """显式展开为稠密 H [n_checks, n_vars] uint8"""
+        H = np.zeros((self.n_checks, self.n_vars), dtype=np.uint8)
+        eye_rows = np.arange(self.z)
+        for r, c, shift in self.blocks:
+            H[r * self.z + eye_rows, c * self.z + (eye_rows + shift) % self.z] = 1
+        return H
+
+    def to_tanner_graph(self):
+        """转换为 TannerGraph，不经过稠密矩阵"""
+        eye_rows = np.arange(self.z)
+        rows = np.concatenate([r * self.z + eye_rows for r, _, _ in self.blocks])
+        cols = np.concatenate([c * self.z + (eye_rows + shift) % self.z for _, c, shift in self.blocks])
+        return TannerGraph(self.n_checks, self.n_vars, rows, cols)
+
+    def _parity_schedule(self):
+        """
+        校验位为最后 mb 个块列。逐个找只剩一个未知校验块的块行 (剥离)，
+        得到按块循环移位回代的求解顺序: [(块行, 求解的块列, 移位), ...]
+        """
+        if self._encode_schedule is not None:
+            return self._encode_schedule
+
+        parity_cols = set(range(self.n_blk_cols - self.n_blk_rows, self.n_blk_cols))
+        unresolved_rows = set(range(self.n_blk_rows))
+        schedule = []
+        while parity_cols:
+            for r in sorted(unresolved_rows):
+                unknown = [c for c in parity_cols if self.shifts[r, c] >= 0]
+                if len(unknown) == 1:
+                    c = unknown[0]
+                    schedule.append((r, c, int(self.shifts[r, c]) % self.z))
+                    parity_cols.remove(c)
+                    unresolved_rows.remove(r)
+                    break
+            else:
+                raise ValueError("parity part of H is not block-triangular; "
+                                 "circulant back-substitution encoding is not available for this code")
+        self._encode_schedule = schedule
+        return schedule
+
+    def encode(self, msgs):
+        """
+        系统编码: 码字 = [信息位 | 校验位]，校验位通过块循环移位回代求出
+        Args:
+            msgs: [M, n_info] 0/1 信息比特
+        Returns:
+            codewords: [M, N] uint8
+        """
+        schedule = self._parity_schedule()
+        msgs = np.asarray(msgs, dtype=np.uint8)
+        codewords = np.zeros(msgs.shape[:-1] + (self.n_vars,), dtype=np.uint8)
+        codewords[..., :self.n_info] = msgs
+        c_blocks = self._split(codewords, self.n_blk_cols)
+
+        for r, target, target_shift in schedule:
+            acc = np.zeros(msgs.shape[:-1] + (self.z,), dtype=np.uint8)
+            for c in np.flatnonzero(self.shifts[r] >= 0):
+                if c != target:
+                    acc ^= np.roll(c_blocks[..., c, :], -(int(self.shifts[r, c]) % self.z), axis=-1)
+            # roll(p, -shift) = acc  =>  p = roll(acc, shift)
+            c_blocks[..., target, :] = np.roll(acc, target_shift, axis=-1)
+        return codewords
@@ -0,0 +1,142 @@
+#!/usr/bin/python3
+# coding=utf-8
+# ===============================================================================
+# LDPC 稀疏 Tanner 图表示
+#
+# 以 CSR 形式同时保存两个方向的邻接表:
+#   check_ptr / check_idx: 第 k 个校验节点连接的变量节点
+#       check_idx[check_ptr[k]:check_ptr[k + 1]]
+#   var_ptr / var_idx:     第 n 个变量节点连接的校验节点
+#       var_idx[var_ptr[n]:var_ptr[n + 1]]
+# 校验子与投票的计算量与边数成正比，而不是 N x M
+# ===============================================================================
+
+import numpy as np
+
+
+def _csr_from_pairs(rows, cols, n_rows):
+    """(rows, cols) 边列表 -> 按 rows 分组的 (ptr, idx)，组内按 cols 升序"""
+    order = np.lexsort((cols, rows))
+    counts = np.bincount(rows, minlength=n_rows)
+    ptr = np.zeros(n_rows + 1, dtype=np.int32)
+    np.cumsum(counts, out=ptr[1:])
+    return ptr, cols[order].astype(np.int32)
+
+
+def _segment_reduce(ufunc, values, ptr):
+    """按 CSR 分段对 values 最后一维做 reduce，空段结果为 0"""
+    n_segments = ptr.size - 1
+    nonempty = np.flatnonzero(ptr[1:] > ptr[:-1])
+    if nonempty.size == n_segments:
+        return ufunc.reduceat(values, ptr[:-1], axis=-1)
+    out = np.zeros(values.shape[:-1] + (n_segments,), dtype=values.dtype)
+    if nonempty.size:
+        out[..., nonempty] = ufunc.reduceat(values, ptr[nonempty], axis=-1)
+    return out
+
+
+class TannerGraph:
+    """
+    LDPC 码的稀疏 Tanner 图，与 H [n_checks, n_vars] 一一对应
+
+    实现 syndrome()/votes()，可直接传给 bitflip_decode 等 CPU 译码路径
+    """
+
+    def __init__(self, n_checks, n_vars, check_rows, var_cols):
+        check_rows = np.asarray(check_rows, dtype=np.int64)
+        var_cols = np.asarray(var_cols, dtype=np.int64)
+        self.n_checks = int(n_checks)
+        self.n_vars = int(n_vars)
+        self.check_ptr, self.check_idx = _csr_from_pairs(check_rows, var_cols, self.n_checks)
+        self.var_ptr, self.var_idx = _csr_from_pairs(var_cols, check_rows, self.n_vars)
+
+    @property
+    def n_edges(self):
+        return int(self.check_idx.size)
+
+    @property
+    def check_degrees(self):
+        return np.diff(self.check_ptr)
+
+    @property
+    def var_degrees(self):
+        return np.diff(self.var_ptr)
+
+    @classmethod
+    def from_dense(cls, H):
+        """由稠密 H [n_checks, n_vars] 构建"""
+        H = np.asarray(H)
+        rows, cols = np.nonzero(H)
+        return cls(H.shape[0], H.shape[1], rows, cols)
+
+    @classmethod
+    def from_transposed(cls, H_transposed):
+        """由 x2_gm 布局的 H^T [n_vars, n_checks] 构建"""
+        H_transposed = np.asarray(H_transposed)
+        cols, rows = np.nonzero(H_transposed)
+        return cls(H_transposed.shape[1], H_transposed.shape[0], rows, cols)
+
+    @classmethod
+    def from_csr(cls, n_checks, n_vars, check_ptr, check_idx, var_ptr, var_idx):
+        """直接使用已排好序的两组 CSR 数组 (如 code_profile 缓存中的内存映射数组)，不重新排序"""
+        graph = cls.__new__(cls)
+        graph.n_checks = int(n_checks)
+        graph.n_vars = int(n_vars)
+        graph.check_ptr, graph.check_idx = check_ptr, check_idx
+        graph.var_ptr, graph.var_idx = var_ptr, var_idx
+        return graph
+
+    @classmethod
+    def from_alist(cls, alist_file):
+        """直接由 alist 文件的行邻接表构建，不经过稠密矩阵"""
+        with open(alist_file, 'r') as f:
+            tokens = np.array(f.read().split(), dtype=np.int64)
+
+        n_cols, n_rows, max_col_weight, max_row_weight = tokens[:4]
+        pos = 4
+        col_weights = tokens[pos:pos + n_cols]
+        pos += n_cols
+        row_weights = tokens[pos:pos + n_rows]
+        pos += n_rows
+
+        # 邻接表有两种写法: 每行补 0 到最大重量，或只写实际重量个索引
+        padded_len = pos + n_cols * max_col_weight + n_rows * max_row_weight
+        compact_len = pos + col_weights.sum() + row_weights.sum()
+        if tokens.size >= padded_len:
+            pos += n_cols * max_col_weight
+            row_lists = tokens[pos:pos + n_rows * max_row_weight].reshape(n_rows, max_row_weight)
+            rows, slots = np.nonzero(row_lists > 0)
+            cols = row_lists[rows, slots] - 1
+        elif tokens.size >= compact_len:
+            pos += col_weights.sum()
+            cols = tokens[pos:pos + row_weights.sum()] - 1
+            rows = np.repeat(np.arange(n_rows), row_weights)
+        else:
+            raise ValueError(f"Alist file incomplete: {alist_file}")
+
+        return cls(n_rows, n_cols, rows, cols)
+
+    def padded(self, n_checks, n_vars):
+        """补齐到 NPU 对齐尺寸 (如 252x504 -> 256x512)，新增节点度数为 0"""
+        if n_checks < self.n_checks or n_vars < self.n_vars:
+            raise ValueError("padded size must not be smaller than the code")
+        rows = np.repeat(np.arange(self.n_checks), self.check_degrees)
+        return TannerGraph(n_checks, n_vars, rows, self.check_idx)
+
+    def to_dense(self):
+        """展开为稠密 H [n_checks, n_vars] uint8"""
+        H = np.zeros((self.n_checks, self.n_vars), dtype=np.uint8)
+        rows = np.repeat(np.arange(self.n_checks), self.check_degrees)
+        H[rows, self.check_idx] = 1
+        return H
+
+    def syndrome(self, bits):
+        """[M, n_vars] 0/1 码字 -> [M, n_checks] uint8 校验子"""
+        gathered = np.asarray(bits, dtype=np.uint8)[..., self.check_idx]
+        return _segment_reduce(np.bitwise_xor, gathered, self.check_ptr) & 1
+
+    def votes(self, syndromes):
+        """[M, n_checks] 0/1 校验子 -> [M, n_vars] int32 投票数"""
+        # 变量节点度数远小于 256，uint8 累加不会溢出
+        gathered = np.asarray(syndromes, dtype=np.uint8)[..., self.var_idx]
+        return _segment_reduce(np.add, gathered, self.var_ptr).astype(np.int32)
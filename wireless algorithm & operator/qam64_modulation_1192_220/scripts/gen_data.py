@@ -1,5 +1,9 @@
 import numpy as np
 import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "common"))
+from qam import get_constellation
 
 def generate_qam64_test_data_gray():
     """生成标准 Gray 码映射的 QAM64 调制测试数据"""
@@ -22,36 +26,23 @@ def generate_qam64_test_data_gray():
     input_bits = np.random.randint(0, 2, (batch_size, symbols_per_batch, bits_per_symbol), dtype=np.uint8)
     
     # --- 核心修改点：重新排列映射表以匹配标准 Gray 码 ---
-    # 索引 (二进制值) -> 电平值的映射关系：
+    # 索引 (二进制值) -> 电平值的映射关系 (公共星座库的 Gray 单轴查找表，已归一化)：
     # 0(000):-7, 1(001):-5, 2(010):-1, 3(011):-3, 4(100):7, 5(101):5, 6(110):1, 7(111):3
-    gray_lut = np.array([-7, -5, -1, -3, 7, 5, 1, 3], dtype=np.float32)
-    norm_factor = 1.0 / np.sqrt(42.0)
-    
-    # 生成期望输出
-    output_real = np.zeros((batch_size, symbols_per_batch), dtype=np.float32)
-    output_imag = np.zeros((batch_size, symbols_per_batch), dtype=np.float32)
-    
-    for b in range(batch_size):
-        for s in range(symbols_per_batch):
-            # 提取 6 个比特
-            b5, b4, b3, b2, b1, b0 = input_bits[b, s]
-            
-            # 计算索引（保持与算子一致的位权逻辑）
-            i_index = (b5 << 2) | (b4 << 1) | b3
-            q_index = (b2 << 2) | (b1 << 1) | b0
-            
-            # 使用修正后的 Gray LUT 映射
-            output_real[b, s] = norm_factor * gray_lut[i_index]
-            output_imag[b, s] = norm_factor * gray_lut[q_index]
+    qam64 = get_constellation(64, "gray")
+    gray_lut = qam64.axis_lut
+    
+    # 生成期望输出: 每 6 比特 (I 路 3 比特在前，保持与算子一致的位权) 合成一个 6 比特
+    # 符号码，一次向量化查 64 项星座表，直接得到 float16 的 I / Q
+    output_real, output_imag = qam64.modulate(input_bits.reshape(batch_size, -1), dtype=np.float16)
     
     # 保存文件
     input_bits.flatten().astype(np.uint8).tofile('./input/input_bits.bin')
     # NPU 算子通常输出 half (float16)
-    output_real.flatten().astype(np.float16).tofile('./output/golden_symbols_real.bin')
-    output_imag.flatten().astype(np.float16).tofile('./output/golden_symbols_imag.bin')
+    output_real.tofile('./output/golden_symbols_real.bin')
+    output_imag.tofile('./output/golden_symbols_imag.bin')
     
     print("✓ Gray 码数据生成完成")
-    print(f"验证点：比特 [0,1,0] 现在映射到电平 {gray_lut[2]*norm_factor:.4f} (预期 -1/sqrt(42))")
+    print(f"验证点：比特 [0,1,0] 现在映射到电平 {gray_lut[2]:.4f} (预期 -1/sqrt(42))")
 
 if __name__ == "__main__":
     generate_qam64_test_data_gray()
\ No newline at end of file